@@ -4,15 +4,25 @@ Convert brake_system_requirements_structured.json to Polarion-compatible format
 This script transforms the hierarchical document structure into work items with proper linking
 """
 
+import functools
 import json
+import mmap
+import os
 import sys
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from itertools import repeat
+from typing import Dict, List, Any, Iterator, Tuple
 try:
     from colorama import init, Fore, Style
     init(autoreset=True)
     COLORS_AVAILABLE = True
+    _SUCCESS_PREFIX = f"{Fore.GREEN}✅ "
+    _INFO_PREFIX = f"{Fore.CYAN}ℹ️  "
+    _ERROR_PREFIX = f"{Fore.RED}❌ "
 except ImportError:
     COLORS_AVAILABLE = False
     
@@ -28,36 +38,180 @@ try:
 except ImportError:
     JSONSCHEMA_AVAILABLE = False
 
+try:
+    import fastjsonschema
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    FASTJSONSCHEMA_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes with orjson if available, otherwise stdlib json"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes with orjson if available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+# Structure required of the structured requirements input
+INPUT_SCHEMA = {
+    "type": "object",
+    "required": ["document"],
+    "properties": {
+        "document": {
+            "type": "object",
+            "required": ["id", "title", "project", "space", "chapters"],
+            "properties": {
+                "chapters": {"type": "array"}
+            }
+        }
+    }
+}
+
+# fastjsonschema generates a specialized validator function once at import
+_INPUT_VALIDATOR = fastjsonschema.compile(INPUT_SCHEMA) if FASTJSONSCHEMA_AVAILABLE else None
+
+# Fixed value strings that are not identifier-like (and so not interned by the
+# compiler) are interned once and shared by every work item that carries them
+_TEXT_HTML = sys.intern("text/html")
+_PRIORITY_100 = sys.intern("100.0")
+_PRIORITY_95 = sys.intern("95.0")
+_PRIORITY_90 = sys.intern("90.0")
+_PRIORITY_50 = sys.intern("50.0")
+_PRIORITY_30 = sys.intern("30.0")
+_DOCUMENT_ID = sys.intern("Python/_default/Functional Concept - Brake System")
+
+def _make_desc(value: str) -> Dict[str, str]:
+    """Build an HTML description field sharing one interned type string"""
+    return {"type": _TEXT_HTML, "value": value}
+
+# Output is written straight to a raw file descriptor in chunks of this size
+_WRITE_CHUNK_SIZE = 1 << 20
+_OUTPUT_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+# Chapters are farmed out to worker processes only for documents with at
+# least this many requirements; below it process start-up dominates
+_PARALLEL_MIN_REQUIREMENTS = 10000
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write the whole buffer to fd, retrying after partial writes"""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+def _dumps_nested(obj: Any, depth: int) -> bytes:
+    """Serialize obj indented for embedding at the given nesting depth"""
+    # Serialized JSON never contains raw newlines inside strings, so
+    # re-indenting line starts is safe
+    return _dumps(obj).replace(b"\n", b"\n" + b"  " * depth)
+
 class BrakeRequirementsConverter:
+    _ID_PREFIX = "Python/"
+    _HEADING_ID_PREFIX = "Python/BR-HEAD-"
+    # Chapter (2) and subchapter (3) heading settings:
+    # description template, priority, parent link description
+    _SECTION_LEVELS = {
+        2: ("<h2>{t}</h2><p>{d}</p>", _PRIORITY_100, "Links to document root"),
+        3: ("<h3>{t}</h3>", _PRIORITY_95, "Links to parent chapter"),
+    }
+    _ROOT_DESCRIPTION = "<h1>{t}</h1><p>Version: {v}</p><p>Created: {c}</p>"
+    # Known input domain used to prebuild the requirement code table; categories
+    # are kept in report order so their counts never need sorting
+    _CATEGORY_ORDER = ("Environmental", "Functional", "Interface", "Maintenance",
+                       "Performance", "Regulatory", "Safety", "Testing")
+    _CATEGORY_INDEX = {category: index for index, category in enumerate(_CATEGORY_ORDER)}
+    _PRIORITIES = ("Critical", "High", "Medium", "Low")
+    
     def __init__(self, input_file: str, output_file: str):
         self.input_file = Path(input_file)
         self.output_file = Path(output_file)
+        # Resolve colored or plain printers once instead of branching per call
+        self.print_success = self._print_success_color if COLORS_AVAILABLE else self._print_success_plain
+        self.print_info = self._print_info_color if COLORS_AVAILABLE else self._print_info_plain
+        self.print_error = self._print_error_color if COLORS_AVAILABLE else self._print_error_plain
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.work_items = []
         self.heading_counter = 1000
-        self.document_id = "Python/_default/Functional Concept - Brake System"
+        # Heading IDs pre-rendered by reserve_heading_ids, starting at _id_pool_base
+        self._id_pool = []
+        self._id_pool_base = self.heading_counter + 1
+        self._type_counts = Counter()
+        # Per-category counts indexed like _CATEGORY_ORDER; anything outside the
+        # known domain is counted by name
+        self._category_counts = array("i", [0] * len(self._CATEGORY_ORDER))
+        self._extra_category_counts = Counter()
+        self.document_id = _DOCUMENT_ID
+        # Shared by every work item; items are only read during serialization
+        self._module_rel = {
+            "module": {
+                "data": {
+                    "type": "documents",
+                    "id": self.document_id
+                }
+            }
+        }
+        # (category, priority) -> (status, severity, priority value, category
+        # index, interned category tag), filled for the known domain up front
+        # and extended on first sight of any other pair; the index is -1 only
+        # for categories outside _CATEGORY_ORDER
+        self._requirement_codes = {
+            (category, priority): self.lookup_requirement_codes(category, priority)
+                + (index, sys.intern(category.lower()))
+            for category, index in self._CATEGORY_INDEX.items()
+            for priority in self._PRIORITIES
+        }
         
     def load_structured_requirements(self) -> Dict:
         """Load the structured brake requirements JSON"""
-        with open(self.input_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(self.input_file, 'rb') as f:
+            # mmap cannot map empty files; let the parser report those
+            if os.fstat(f.fileno()).st_size == 0:
+                return _loads(b"")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if ORJSON_AVAILABLE:
+                    # orjson parses straight from the mapped pages
+                    with memoryview(mm) as view:
+                        return orjson.loads(view)
+                return _loads(mm[:])
+    
+    def reserve_heading_ids(self, count: int) -> None:
+        """Pre-render the next count heading IDs in one pass"""
+        first = self.heading_counter + 1
+        self._id_pool_base = first
+        self._id_pool = [self._HEADING_ID_PREFIX + str(i) for i in range(first, first + count)]
     
     def generate_heading_id(self) -> str:
         """Generate a unique heading ID"""
         self.heading_counter += 1
-        return f"Python/BR-HEAD-{self.heading_counter}"
+        idx = self.heading_counter - self._id_pool_base
+        if idx < len(self._id_pool):
+            return self._id_pool[idx]
+        return f"{self._HEADING_ID_PREFIX}{self.heading_counter}"
     
-    def map_priority(self, priority: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def map_priority(priority: str) -> str:
         """Map priority strings to Polarion priority values"""
         priority_map = {
-            "Critical": "100.0",
-            "High": "90.0",
-            "Medium": "50.0",
-            "Low": "30.0"
+            "Critical": _PRIORITY_100,
+            "High": _PRIORITY_90,
+            "Medium": _PRIORITY_50,
+            "Low": _PRIORITY_30
         }
-        return priority_map.get(priority, "50.0")
+        return priority_map.get(priority, _PRIORITY_50)
     
-    def map_severity(self, category: str, priority: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def map_severity(category: str, priority: str) -> str:
         """Map category and priority to severity"""
         if category == "Safety" and priority == "Critical":
             return "safety_critical"
@@ -70,7 +224,9 @@ class BrakeRequirementsConverter:
         else:
             return "nice_to_have"
     
-    def map_status(self, category: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def map_status(category: str) -> str:
         """Map category to appropriate status"""
         status_map = {
             "Regulatory": "approved",
@@ -84,66 +240,88 @@ class BrakeRequirementsConverter:
         }
         return status_map.get(category, "draft")
     
-    def create_heading_workitem(self, heading: str, level: int, parent_id: Optional[str] = None) -> Dict:
-        """Create a heading work item"""
-        heading_id = self.generate_heading_id()
-        
-        workitem = {
-            "id": heading_id,
+    def _make_heading_root(self, heading: str, description: str, priority: str,
+                           outline: str) -> Dict:
+        """Create a heading work item without a parent link"""
+        self._type_counts["heading"] += 1
+        return {
+            "id": self.generate_heading_id(),
             "type": "heading",
             "title": heading,
-            "description": {
-                "type": "text/html",
-                "value": f"<h{level}>{heading}</h{level}>"
-            },
+            "description": _make_desc(description),
             "status": "approved",
-            "priority": "100.0",
-            "relationships": {
-                "module": {
-                    "data": {
-                        "type": "documents",
-                        "id": self.document_id
-                    }
-                }
-            }
+            "priority": priority,
+            "relationships": self._module_rel,
+            "outlineNumber": outline
         }
-        
-        if parent_id:
-            workitem["links"] = [{
+    
+    def _make_heading_child(self, heading: str, description: str, priority: str,
+                            outline: str, parent_id: str, link_description: str) -> Dict:
+        """Create a heading work item linked to its parent heading"""
+        self._type_counts["heading"] += 1
+        return {
+            "id": self.generate_heading_id(),
+            "type": "heading",
+            "title": heading,
+            "description": _make_desc(description),
+            "status": "approved",
+            "priority": priority,
+            "relationships": self._module_rel,
+            "outlineNumber": outline,
+            "links": [{
                 "target_id": parent_id,
                 "role": "has_parent",
-                "description": f"Links to parent heading"
+                "description": link_description
             }]
-        
-        return workitem
+        }
+    
+    def lookup_requirement_codes(self, category: str, priority: str) -> Tuple[str, str, str]:
+        """Resolve status, severity and Polarion priority for a requirement"""
+        return (self.map_status(category),
+                self.map_severity(category, priority),
+                self.map_priority(priority))
+    
+    def category_breakdown(self) -> List[Tuple[str, int]]:
+        """Return (category, count) pairs for all seen categories in name order"""
+        rows = [(category, count)
+                for category, count in zip(self._CATEGORY_ORDER, self._category_counts) if count]
+        if self._extra_category_counts:
+            rows = sorted(rows + list(self._extra_category_counts.items()))
+        return rows
     
     def create_requirement_workitem(self, req: Dict, parent_heading_id: str, outline_number: str) -> Dict:
         """Create a requirement work item with proper linking"""
+        req_id = req["id"]
+        category = req["category"]
+        priority = req["priority"]
+        self._type_counts["requirement"] += 1
+        
+        codes = self._requirement_codes.get((category, priority))
+        if codes is None:
+            codes = self._requirement_codes[(category, priority)] = \
+                self.lookup_requirement_codes(category, priority) \
+                + (self._CATEGORY_INDEX.get(category, -1), sys.intern(category.lower()))
+        status, severity, priority_value, category_index, category_tag = codes
+        if category_index >= 0:
+            self._category_counts[category_index] += 1
+        else:
+            self._extra_category_counts[category] += 1
+        
         workitem = {
-            "id": f"Python/{req['id']}",
+            "id": self._ID_PREFIX + req_id,
             "type": "requirement",
             "title": req["title"],
-            "description": {
-                "type": "text/html",
-                "value": f"<p>{req['description']}</p>"
-            },
-            "status": self.map_status(req["category"]),
-            "severity": self.map_severity(req["category"], req["priority"]),
-            "priority": self.map_priority(req["priority"]),
-            "categories": [req["category"].lower()],
+            "description": _make_desc("".join(("<p>", req["description"], "</p>"))),
+            "status": status,
+            "severity": severity,
+            "priority": priority_value,
+            "categories": [category_tag],
             "custom_fields": {
-                "requirement_id": req["id"],
-                "category": req["category"],
-                "original_priority": req["priority"]
-            },
-            "relationships": {
-                "module": {
-                    "data": {
-                        "type": "documents",
-                        "id": self.document_id
-                    }
-                }
+                "requirement_id": req_id,
+                "category": category,
+                "original_priority": priority
             },
+            "relationships": self._module_rel,
             "outlineNumber": outline_number,
             "links": [
                 {
@@ -156,126 +334,153 @@ class BrakeRequirementsConverter:
         
         return workitem
     
-    def process_chapter(self, chapter: Dict, chapter_num: int, parent_id: Optional[str] = None) -> List[Dict]:
-        """Process a chapter and its contents"""
-        items = []
-        
-        # Create heading for the chapter
-        chapter_heading_id = self.generate_heading_id()
-        chapter_heading = {
-            "id": chapter_heading_id,
-            "type": "heading",
-            "title": chapter["heading"],
-            "description": {
-                "type": "text/html",
-                "value": f"<h2>{chapter['heading']}</h2><p>{chapter.get('description', '')}</p>"
-            },
-            "status": "approved",
-            "priority": "100.0",
-            "relationships": {
-                "module": {
-                    "data": {
-                        "type": "documents",
-                        "id": self.document_id
-                    }
-                }
-            },
-            "outlineNumber": str(chapter_num)
-        }
+    def walk_chapters(self, chapters: List[Dict], parent_id: str,
+                      first_num: int) -> Iterator[Dict]:
+        """Yield chapter/subchapter headings and their work items in document order"""
+        # Iterative depth-first walk; nodes are pushed in reverse so they pop
+        # (and consume heading IDs) in document order
+        stack = [(chapter, 2, str(num), parent_id)
+                 for num, chapter in reversed(list(enumerate(chapters, first_num)))]
+        create_requirement = self.create_requirement_workitem
         
-        if parent_id:
-            chapter_heading["links"] = [{
-                "target_id": parent_id,
-                "role": "has_parent",
-                "description": "Links to document root"
-            }]
-        
-        items.append(chapter_heading)
+        while stack:
+            node, level, outline, node_parent_id = stack.pop()
+            template, priority, link_description = self._SECTION_LEVELS[level]
+            
+            # Create heading for the chapter/subchapter; chapters link to the
+            # document root heading, subchapters to their chapter
+            title = node["heading"]
+            description = template.format(t=title, d=node.get("description", ""))
+            heading = self._make_heading_child(title, description, priority, outline,
+                                               node_parent_id, link_description)
+            heading_id = heading["id"]
+            
+            yield heading
+            
+            # Process work items directly under this heading; their outline
+            # numbers are rendered for the whole block in one C-level pass
+            prefix = outline + "."
+            workitems = node.get("workitems") or ()
+            outlines = map(prefix.__add__, map(str, range(1, len(workitems) + 1)))
+            for workitem, outline_number in zip(workitems, outlines):
+                yield create_requirement(workitem, heading_id, outline_number)
+            
+            # Only chapters carry subchapters
+            if level == 2:
+                subchapters = node.get("subchapters") or ()
+                for sub_idx in range(len(subchapters), 0, -1):
+                    stack.append((subchapters[sub_idx - 1], 3, prefix + str(sub_idx), heading_id))
+    
+    def iter_work_items(self, document: Dict) -> Iterator[Dict]:
+        """Yield the root heading followed by all chapter work items"""
+        chapters = document["chapters"]
+        self.reserve_heading_ids(1 + self.count_headings(chapters))
         
-        # Process direct work items in chapter
-        if "workitems" in chapter and chapter["workitems"]:
-            for idx, workitem in enumerate(chapter["workitems"], 1):
-                outline = f"{chapter_num}.{idx}"
-                items.append(self.create_requirement_workitem(workitem, chapter_heading_id, outline))
+        # Create root document heading
+        root_heading = self._make_heading_root(
+            document["title"],
+            self._ROOT_DESCRIPTION.format(
+                t=document["title"], v=document["version"], c=document["created"]),
+            _PRIORITY_100, "1")
+        root_heading_id = root_heading["id"]
         
-        # Process subchapters
-        if "subchapters" in chapter:
-            for sub_idx, subchapter in enumerate(chapter["subchapters"], 1):
-                items.extend(self.process_subchapter(
-                    subchapter, 
-                    chapter_num, 
-                    sub_idx, 
-                    chapter_heading_id
-                ))
+        yield root_heading
         
-        return items
+        # Process all chapters
+        if len(chapters) > 1 and self.count_requirements(chapters) >= _PARALLEL_MIN_REQUIREMENTS:
+            yield from self.process_chapters_parallel(chapters, root_heading_id)
+        else:
+            yield from self.walk_chapters(chapters, root_heading_id, 2)
     
-    def process_subchapter(self, subchapter: Dict, chapter_num: int, sub_num: int, 
-                          parent_heading_id: str) -> List[Dict]:
-        """Process a subchapter and its work items"""
-        items = []
-        
-        # Create heading for the subchapter
-        subchapter_heading_id = self.generate_heading_id()
-        subchapter_heading = {
-            "id": subchapter_heading_id,
-            "type": "heading",
-            "title": subchapter["heading"],
-            "description": {
-                "type": "text/html",
-                "value": f"<h3>{subchapter['heading']}</h3>"
-            },
-            "status": "approved",
-            "priority": "95.0",
-            "relationships": {
-                "module": {
-                    "data": {
-                        "type": "documents",
-                        "id": self.document_id
-                    }
-                }
-            },
-            "outlineNumber": f"{chapter_num}.{sub_num}",
-            "links": [{
-                "target_id": parent_heading_id,
-                "role": "has_parent",
-                "description": "Links to parent chapter"
-            }]
-        }
-        
-        items.append(subchapter_heading)
+    @staticmethod
+    def count_chapter_headings(chapter: Dict) -> int:
+        """Count the heading IDs walk_chapters consumes for a chapter"""
+        return 1 + len(chapter.get("subchapters") or ())
+    
+    @classmethod
+    def count_headings(cls, chapters: List[Dict]) -> int:
+        """Count the heading IDs walk_chapters consumes for all chapters"""
+        return sum(cls.count_chapter_headings(chapter) for chapter in chapters)
+    
+    @staticmethod
+    def count_requirements(chapters: List[Dict]) -> int:
+        """Count the requirements in all chapters and subchapters"""
+        total = 0
+        for chapter in chapters:
+            total += len(chapter.get("workitems") or ())
+            for subchapter in chapter.get("subchapters", ()):
+                total += len(subchapter.get("workitems", ()))
+        return total
+    
+    def process_chapters_parallel(self, chapters: List[Dict], parent_id: str) -> Iterator[Dict]:
+        """Process chapters in worker processes, yielding items in document order"""
+        # Each chapter gets a precomputed heading ID range so workers never
+        # need to coordinate; results are merged in submission order
+        id_bases = []
+        next_id = self.heading_counter
+        for chapter in chapters:
+            id_bases.append(next_id)
+            next_id += self.count_chapter_headings(chapter)
         
-        # Process work items in subchapter
-        if "workitems" in subchapter:
-            for idx, workitem in enumerate(subchapter["workitems"], 1):
-                outline = f"{chapter_num}.{sub_num}.{idx}"
-                items.append(self.create_requirement_workitem(workitem, subchapter_heading_id, outline))
+        with ProcessPoolExecutor() as executor:
+            results = executor.map(
+                _process_chapter_pure,
+                chapters,
+                range(2, len(chapters) + 2),
+                repeat(parent_id),
+                id_bases
+            )
+            for items, type_counts, category_counts, extra_category_counts in results:
+                self._type_counts.update(type_counts)
+                for index, count in enumerate(category_counts):
+                    self._category_counts[index] += count
+                self._extra_category_counts.update(extra_category_counts)
+                yield from items
         
-        return items
+        self.heading_counter = next_id
     
-    def print_success(self, message: str):
-        """Print success message with color if available"""
-        if COLORS_AVAILABLE:
-            print(f"{Fore.GREEN}✅ {message}{Style.RESET_ALL}")
-        else:
-            print(f"✅ {message}")
+    def _print_success_color(self, message: str):
+        """Print success message in color"""
+        print(f"{_SUCCESS_PREFIX}{message}{Style.RESET_ALL}")
     
-    def print_info(self, message: str):
-        """Print info message with color if available"""
-        if COLORS_AVAILABLE:
-            print(f"{Fore.CYAN}ℹ️  {message}{Style.RESET_ALL}")
-        else:
-            print(f"ℹ️  {message}")
+    def _print_success_plain(self, message: str):
+        """Print success message without color"""
+        print(f"✅ {message}")
     
-    def print_error(self, message: str):
-        """Print error message with color if available"""
-        if COLORS_AVAILABLE:
-            print(f"{Fore.RED}❌ {message}{Style.RESET_ALL}")
-        else:
-            print(f"❌ {message}")
+    def _print_info_color(self, message: str):
+        """Print info message in color"""
+        print(f"{_INFO_PREFIX}{message}{Style.RESET_ALL}")
+    
+    def _print_info_plain(self, message: str):
+        """Print info message without color"""
+        print(f"ℹ️  {message}")
+    
+    def _print_error_color(self, message: str):
+        """Print error message in color"""
+        print(f"{_ERROR_PREFIX}{message}{Style.RESET_ALL}")
+    
+    def _print_error_plain(self, message: str):
+        """Print error message without color"""
+        print(f"❌ {message}")
     
     def validate_input(self, data: Dict) -> bool:
         """Validate input data structure"""
+        if _INPUT_VALIDATOR is not None:
+            try:
+                _INPUT_VALIDATOR(data)
+                return True
+            except fastjsonschema.JsonSchemaException as e:
+                self.print_error(f"Invalid input JSON: {e}")
+                return False
+        
+        if JSONSCHEMA_AVAILABLE:
+            try:
+                validate(data, INPUT_SCHEMA)
+                return True
+            except ValidationError as e:
+                self.print_error(f"Invalid input JSON: {e.message}")
+                return False
+        
         if "document" not in data:
             self.print_error("Missing 'document' key in input JSON")
             return False
@@ -311,38 +516,15 @@ class BrakeRequirementsConverter:
             
             document = data["document"]
             
-            # Create root document heading
-            root_heading_id = self.generate_heading_id()
-            root_heading = {
-                "id": root_heading_id,
-                "type": "heading", 
-                "title": document["title"],
-                "description": {
-                    "type": "text/html",
-                    "value": f"<h1>{document['title']}</h1><p>Version: {document['version']}</p><p>Created: {document['created']}</p>"
-                },
-                "status": "approved",
-                "priority": "100.0",
-                "relationships": {
-                    "module": {
-                        "data": {
-                            "type": "documents",
-                            "id": self.document_id
-                        }
-                    }
-                },
-                "outlineNumber": "1"
-            }
-            
-            self.work_items.append(root_heading)
-            
-            # Process all chapters
-            for chapter_num, chapter in enumerate(document["chapters"], 1):
-                self.work_items.extend(self.process_chapter(chapter, chapter_num + 1, root_heading_id))
-            
-            # Create output structure
-            output = {
-                "document": {
+            # Save output, streaming work items as they are produced. They are
+            # written next to the output file, which is only replaced once the
+            # whole document has been converted
+            self.print_info(f"Saving output to: {self.output_file}")
+            tmp_file = self.output_file.with_name(self.output_file.name + ".tmp")
+            fd = os.open(tmp_file, _OUTPUT_FLAGS, 0o644)
+            try:
+                buf = bytearray(b'{\n  "document": ')
+                buf += _dumps_nested({
                     "id": self.document_id,
                     "title": document["title"],
                     "type": "Functional Concept",
@@ -350,53 +532,68 @@ class BrakeRequirementsConverter:
                     "space": document["space"],
                     "version": document["version"],
                     "created": self.timestamp
-                },
-                "work_items": self.work_items,
-                "metadata": {
-                    "total_items": len(self.work_items),
-                    "total_requirements": len([w for w in self.work_items if w["type"] == "requirement"]),
-                    "total_headings": len([w for w in self.work_items if w["type"] == "heading"]),
+                }, 1)
+                buf += b',\n  "work_items": ['
+                
+                separator = b"\n    "
+                for item in self.iter_work_items(document):
+                    buf += separator
+                    buf += _dumps_nested(item, 2)
+                    separator = b",\n    "
+                    if len(buf) >= _WRITE_CHUNK_SIZE:
+                        _write_all(fd, buf)
+                        buf.clear()
+                
+                total_items = sum(self._type_counts.values())
+                metadata = {
+                    "total_items": total_items,
+                    "total_requirements": self._type_counts["requirement"],
+                    "total_headings": self._type_counts["heading"],
                     "conversion_timestamp": self.timestamp
                 }
-            }
-        
-            # Save output
-            self.print_info(f"Saving output to: {self.output_file}")
-            with open(self.output_file, 'w', encoding='utf-8') as f:
-                json.dump(output, f, indent=2, ensure_ascii=False)
+                buf += b'\n  ],\n  "metadata": ' if total_items else b'],\n  "metadata": '
+                buf += _dumps_nested(metadata, 1)
+                buf += b"\n}"
+                _write_all(fd, buf)
+            except BaseException:
+                os.close(fd)
+                tmp_file.unlink(missing_ok=True)
+                raise
+            os.close(fd)
+            os.replace(tmp_file, self.output_file)
             
             self.print_success("Conversion completed successfully!")
             self.print_info(f"Output saved to: {self.output_file}")
             
+            # Automated runs (CI, pipes) get a terse machine-readable summary
+            if not sys.stdout.isatty():
+                print(json.dumps(metadata))
+                return
+            
             # Print statistics
             if TABULATE_AVAILABLE:
                 stats_table = [
-                    ["Total items", output['metadata']['total_items']],
-                    ["Requirements", output['metadata']['total_requirements']],
-                    ["Headings", output['metadata']['total_headings']]
+                    ["Total items", metadata['total_items']],
+                    ["Requirements", metadata['total_requirements']],
+                    ["Headings", metadata['total_headings']]
                 ]
                 print("\n📊 Statistics:")
                 print(tabulate(stats_table, headers=["Metric", "Count"], tablefmt="grid"))
             else:
                 print("\n📊 Statistics:")
-                print(f"   - Total items: {output['metadata']['total_items']}")
-                print(f"   - Requirements: {output['metadata']['total_requirements']}")
-                print(f"   - Headings: {output['metadata']['total_headings']}")
+                print(f"   - Total items: {metadata['total_items']}")
+                print(f"   - Requirements: {metadata['total_requirements']}")
+                print(f"   - Headings: {metadata['total_headings']}")
             
             # Print category breakdown
-            categories = {}
-            for item in self.work_items:
-                if item["type"] == "requirement":
-                    cat = item["custom_fields"]["category"]
-                    categories[cat] = categories.get(cat, 0) + 1
-            
+            categories = self.category_breakdown()
             if categories:
                 print("\n📂 Requirements by Category:")
                 if TABULATE_AVAILABLE:
-                    cat_table = [[cat, count] for cat, count in sorted(categories.items())]
+                    cat_table = [[cat, count] for cat, count in categories]
                     print(tabulate(cat_table, headers=["Category", "Count"], tablefmt="grid"))
                 else:
-                    for cat, count in sorted(categories.items()):
+                    for cat, count in categories:
                         print(f"   - {cat}: {count}")
                         
         except FileNotFoundError as e:
@@ -411,6 +608,16 @@ class BrakeRequirementsConverter:
             traceback.print_exc()
             sys.exit(1)
 
+def _process_chapter_pure(chapter: Dict, chapter_num: int, parent_id: str,
+                          id_base: int) -> Tuple[List[Dict], Counter, array, Counter]:
+    """Convert one chapter in a worker process starting at a given heading ID"""
+    converter = BrakeRequirementsConverter("", "")
+    converter.heading_counter = id_base
+    converter.reserve_heading_ids(converter.count_chapter_headings(chapter))
+    items = list(converter.walk_chapters([chapter], parent_id, chapter_num))
+    return (items, converter._type_counts, converter._category_counts,
+            converter._extra_category_counts)
+
 def main():
     """Main execution function"""
     import argparse
@@ -5,16 +5,28 @@ This script transforms the hierarchical document structure into work items that
 """
 
 import json
+import operator
+import os
+import re
 import sys
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 try:
     from colorama import init, Fore, Style
     init(autoreset=True)
     COLORS_AVAILABLE = True
+    _SUCCESS_FMT = f"{Fore.GREEN}✅ {{}}{Style.RESET_ALL}"
+    _INFO_FMT = f"{Fore.CYAN}ℹ️  {{}}{Style.RESET_ALL}"
+    _ERROR_FMT = f"{Fore.RED}❌ {{}}{Style.RESET_ALL}"
+    _WARNING_FMT = f"{Fore.YELLOW}⚠️  {{}}{Style.RESET_ALL}"
 except ImportError:
     COLORS_AVAILABLE = False
+    _SUCCESS_FMT = "✅ {}"
+    _INFO_FMT = "ℹ️  {}"
+    _ERROR_FMT = "❌ {}"
+    _WARNING_FMT = "⚠️  {}"
     
 try:
     from tabulate import tabulate
@@ -28,14 +40,78 @@ try:
 except ImportError:
     JSONSCHEMA_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes with orjson if available, otherwise stdlib json"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps(obj: Any, compact: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize to indented (or compact) UTF-8 JSON bytes with orjson if available"""
+    if ORJSON_AVAILABLE:
+        option = 0 if compact else orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"),
+                          sort_keys=sort_keys).encode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=sort_keys).encode("utf-8")
+
+# Output is written straight to a raw file descriptor in one go
+_OUTPUT_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write the whole buffer to fd, retrying after partial writes"""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+# Keys every input document must provide
+_REQUIRED_KEYS = frozenset({"id", "title", "project", "space", "chapters"})
+
+# Leading outline number of a heading title, e.g. "3. " or "3.1 "
+_OUTLINE_STRIP_RE = re.compile(r'^\d+\.?\d*\s+')
+
 class BrakeRequirementsConverter:
-    def __init__(self, input_file: str, output_file: str, heading_map_file: Optional[str] = None):
+    # Known input domain used to prebuild the requirement code table
+    _CATEGORIES = ("Regulatory", "Safety", "Functional", "Performance",
+                   "Interface", "Environmental", "Maintenance", "Testing")
+    _PRIORITIES = ("Critical", "High", "Medium", "Low")
+    
+    def __init__(self, input_file: str, output_file: str, heading_map_file: Optional[str] = None,
+                 compact: bool = False):
         self.input_file = Path(input_file)
         self.output_file = Path(output_file)
         self.heading_map_file = Path(heading_map_file) if heading_map_file else None
+        self.compact = compact
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.work_items = []
+        self._requirement_count = 0
         self.document_id = "Python/_default/Functional Concept - Brake System"
+        # Shared by every work item; items are only read during serialization
+        self._module_rel = {
+            "module": {
+                "data": {
+                    "type": "documents",
+                    "id": self.document_id
+                }
+            }
+        }
+        # (category, priority) -> (status, severity, priority value), filled for
+        # the known domain up front and extended on first sight of anything else
+        self._requirement_codes = {
+            (category, priority): self.lookup_requirement_codes(category, priority)
+            for category in self._CATEGORIES
+            for priority in self._PRIORITIES
+        }
         
         # Default heading IDs - these should map to existing headings in Polarion
         self.heading_ids = {
@@ -78,34 +154,45 @@ class BrakeRequirementsConverter:
         # Load custom heading map if provided
         if self.heading_map_file and self.heading_map_file.exists():
             self.load_heading_map()
+        else:
+            self.index_heading_ids()
+    
+    def index_heading_ids(self):
+        """Index heading IDs by title without outline number for fallback lookups"""
+        self._cleaned_heading_ids = {}
+        self._heading_id_cache: Dict[str, str] = {}
+        for key, value in self.heading_ids.items():
+            self._cleaned_heading_ids.setdefault(_OUTLINE_STRIP_RE.sub('', key), value)
     
     def load_heading_map(self):
         """Load custom heading ID mappings from file"""
         try:
-            with open(self.heading_map_file, 'r', encoding='utf-8') as f:
-                custom_map = json.load(f)
-                self.heading_ids.update(custom_map)
-                self.print_info(f"Loaded custom heading mappings from {self.heading_map_file}")
+            custom_map = _loads(self.heading_map_file.read_bytes())
+            self.heading_ids.update(custom_map)
+            self.print_info(f"Loaded custom heading mappings from {self.heading_map_file}")
         except Exception as e:
             self.print_error(f"Failed to load heading map: {e}")
+        self.index_heading_ids()
     
     def load_structured_requirements(self) -> Dict:
         """Load the structured brake requirements JSON"""
-        with open(self.input_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return _loads(self.input_file.read_bytes())
     
     def get_heading_id(self, heading_title: str) -> str:
         """Get the heading ID for a given heading title"""
-        # First try exact match
-        if heading_title in self.heading_ids:
-            return self.heading_ids[heading_title]
+        # Titles repeat for every work item under the same heading
+        heading_id = self._heading_id_cache.get(heading_title)
+        if heading_id is not None:
+            return heading_id
         
-        # Try without numbering (e.g., "3. Functional Requirements" -> "Functional Requirements")
-        import re
-        cleaned_title = re.sub(r'^\d+\.?\d*\s+', '', heading_title)
-        for key, value in self.heading_ids.items():
-            if cleaned_title in key:
-                return value
+        # First try exact match, then without numbering
+        # (e.g., "3. Functional Requirements" -> "Functional Requirements")
+        heading_id = self.heading_ids.get(heading_title)
+        if heading_id is None:
+            heading_id = self._cleaned_heading_ids.get(_OUTLINE_STRIP_RE.sub('', heading_title))
+        if heading_id is not None:
+            self._heading_id_cache[heading_title] = heading_id
+            return heading_id
         
         # Default fallback - generate a warning
         self.print_warning(f"No heading ID found for '{heading_title}', using default")
@@ -148,109 +235,112 @@ class BrakeRequirementsConverter:
         }
         return status_map.get(category, "draft")
     
-    def create_requirement_workitem(self, req: Dict, parent_heading_title: str, outline_number: str) -> Dict:
-        """Create a requirement work item with proper linking to existing headings"""
-        parent_heading_id = self.get_heading_id(parent_heading_title)
+    def lookup_requirement_codes(self, category: str, priority: str) -> Tuple[str, str, str]:
+        """Resolve status, severity and Polarion priority for a requirement"""
+        return (self.map_status(category),
+                self.map_severity(category, priority),
+                self.map_priority(priority))
+    
+    def create_requirement_workitem(self, req: Dict, parent_heading_id: str, outline_number: str,
+                                    link_description: str) -> Dict:
+        """Create a requirement work item linked to an existing heading"""
+        req_id = req["id"]
+        category = req["category"]
+        priority = req["priority"]
+        
+        codes = self._requirement_codes.get((category, priority))
+        if codes is None:
+            codes = self._requirement_codes[(category, priority)] = \
+                self.lookup_requirement_codes(category, priority)
+        status, severity, priority_value = codes
         
         workitem = {
-            "id": f"Python/{req['id']}",
+            "id": f"Python/{req_id}",
             "type": "requirement",
             "title": req["title"],
             "description": {
                 "type": "text/html",
                 "value": f"<p>{req['description']}</p>"
             },
-            "status": self.map_status(req["category"]),
-            "severity": self.map_severity(req["category"], req["priority"]),
-            "priority": self.map_priority(req["priority"]),
-            "categories": [req["category"].lower()],
+            "status": status,
+            "severity": severity,
+            "priority": priority_value,
+            "categories": [category.lower()],
             "custom_fields": {
-                "requirement_id": req["id"],
-                "category": req["category"],
-                "original_priority": req["priority"]
-            },
-            "relationships": {
-                "module": {
-                    "data": {
-                        "type": "documents",
-                        "id": self.document_id
-                    }
-                }
+                "requirement_id": req_id,
+                "category": category,
+                "original_priority": priority
             },
+            "relationships": self._module_rel,
             "outlineNumber": outline_number,
             "links": [
                 {
                     "target_id": parent_heading_id,
                     "role": "has_parent",
-                    "description": f"Links to {parent_heading_title}"
+                    "description": link_description
                 }
             ]
         }
         
+        self._requirement_count += 1
         return workitem
     
-    def process_chapter(self, chapter: Dict, chapter_num: int) -> List[Dict]:
-        """Process a chapter and extract only work items (no headings)"""
-        items = []
+    def process_chapter(self, chapter: Dict, chapter_num: int, out: List[Dict]) -> List[Dict]:
+        """Append a chapter's work items (no headings) to out"""
         chapter_title = chapter["heading"]
         
+        create_requirement = self.create_requirement_workitem
+        append = out.append
+        
         # Process direct work items in chapter
         if "workitems" in chapter and chapter["workitems"]:
+            parent_id = self.get_heading_id(chapter_title)
+            link_desc = f"Links to {chapter_title}"
+            outline_prefix = f"{chapter_num}."
             for idx, workitem in enumerate(chapter["workitems"], 1):
-                outline = f"{chapter_num}.{idx}"
-                items.append(self.create_requirement_workitem(workitem, chapter_title, outline))
+                append(create_requirement(workitem, parent_id, outline_prefix + str(idx), link_desc))
         
         # Process subchapters
         if "subchapters" in chapter:
             for sub_idx, subchapter in enumerate(chapter["subchapters"], 1):
-                items.extend(self.process_subchapter(
-                    subchapter, 
-                    chapter_num, 
-                    sub_idx
-                ))
+                self.process_subchapter(subchapter, chapter_num, sub_idx, out)
         
-        return items
+        return out
     
-    def process_subchapter(self, subchapter: Dict, chapter_num: int, sub_num: int) -> List[Dict]:
-        """Process a subchapter and extract only work items"""
-        items = []
+    def process_subchapter(self, subchapter: Dict, chapter_num: int, sub_num: int,
+                           out: List[Dict]) -> List[Dict]:
+        """Append a subchapter's work items to out"""
         subchapter_title = subchapter["heading"]
         
-        # Process work items in subchapter
-        if "workitems" in subchapter:
+        create_requirement = self.create_requirement_workitem
+        append = out.append
+        
+        # Process work items in subchapter; an empty subchapter needs no
+        # parent heading, so do not look one up (or warn about it)
+        if subchapter.get("workitems"):
+            parent_id = self.get_heading_id(subchapter_title)
+            link_desc = f"Links to {subchapter_title}"
+            outline_prefix = f"{chapter_num}.{sub_num}."
             for idx, workitem in enumerate(subchapter["workitems"], 1):
-                outline = f"{chapter_num}.{sub_num}.{idx}"
-                items.append(self.create_requirement_workitem(workitem, subchapter_title, outline))
+                append(create_requirement(workitem, parent_id, outline_prefix + str(idx), link_desc))
         
-        return items
+        return out
     
     def print_success(self, message: str):
         """Print success message with color if available"""
-        if COLORS_AVAILABLE:
-            print(f"{Fore.GREEN}✅ {message}{Style.RESET_ALL}")
-        else:
-            print(f"✅ {message}")
+        print(_SUCCESS_FMT.format(message))
     
     def print_info(self, message: str):
         """Print info message with color if available"""
-        if COLORS_AVAILABLE:
-            print(f"{Fore.CYAN}ℹ️  {message}{Style.RESET_ALL}")
-        else:
-            print(f"ℹ️  {message}")
+        print(_INFO_FMT.format(message))
     
     def print_error(self, message: str):
         """Print error message with color if available"""
-        if COLORS_AVAILABLE:
-            print(f"{Fore.RED}❌ {message}{Style.RESET_ALL}")
-        else:
-            print(f"❌ {message}")
+        print(_ERROR_FMT.format(message))
     
     def print_warning(self, message: str):
         """Print warning message with color if available"""
-        if COLORS_AVAILABLE:
-            print(f"{Fore.YELLOW}⚠️  {message}{Style.RESET_ALL}")
-        else:
-            print(f"⚠️  {message}")
+        print(_WARNING_FMT.format(message))
     
     def validate_input(self, data: Dict) -> bool:
         """Validate input data structure"""
@@ -259,11 +349,11 @@ class BrakeRequirementsConverter:
             return False
         
         doc = data["document"]
-        required_keys = ["id", "title", "project", "space", "chapters"]
-        for key in required_keys:
-            if key not in doc:
-                self.print_error(f"Missing required key '{key}' in document")
-                return False
+        missing = _REQUIRED_KEYS.difference(doc)
+        if missing:
+            keys = "', '".join(sorted(missing))
+            self.print_error(f"Missing required key(s) '{keys}' in document")
+            return False
         
         if not isinstance(doc["chapters"], list):
             self.print_error("'chapters' must be a list")
@@ -274,8 +364,7 @@ class BrakeRequirementsConverter:
     def save_heading_map(self):
         """Save the current heading map to a file for reference"""
         map_file = self.output_file.parent / "heading_map.json"
-        with open(map_file, 'w', encoding='utf-8') as f:
-            json.dump(self.heading_ids, f, indent=2, ensure_ascii=False)
+        map_file.write_bytes(_dumps(self.heading_ids, sort_keys=True))
         self.print_info(f"Heading map saved to {map_file}")
     
     def convert(self):
@@ -298,7 +387,18 @@ class BrakeRequirementsConverter:
             
             # Process all chapters (only extracting work items, no headings)
             for chapter_num, chapter in enumerate(document["chapters"], 1):
-                self.work_items.extend(self.process_chapter(chapter, chapter_num))
+                self.process_chapter(chapter, chapter_num, self.work_items)
+            
+            # Gather category and heading reference counts; Counter does the
+            # counting in C
+            categories = Counter(item["custom_fields"]["category"]
+                                 for item in self.work_items if item["type"] == "requirement")
+            heading_refs = Counter(link["target_id"]
+                                   for item in self.work_items
+                                   for link in item.get("links", ())
+                                   if link["role"] == "has_parent")
+            total_items = len(self.work_items)
+            total_requirements = self._requirement_count
             
             # Create output structure
             output = {
@@ -313,8 +413,8 @@ class BrakeRequirementsConverter:
                 },
                 "work_items": self.work_items,
                 "metadata": {
-                    "total_items": len(self.work_items),
-                    "total_requirements": len([w for w in self.work_items if w["type"] == "requirement"]),
+                    "total_items": total_items,
+                    "total_requirements": total_requirements,
                     "conversion_timestamp": self.timestamp,
                     "note": "Work items only - headings must exist in Polarion document"
                 }
@@ -322,8 +422,12 @@ class BrakeRequirementsConverter:
             
             # Save output
             self.print_info(f"Saving output to: {self.output_file}")
-            with open(self.output_file, 'w', encoding='utf-8') as f:
-                json.dump(output, f, indent=2, ensure_ascii=False)
+            blob = _dumps(output, self.compact)
+            fd = os.open(self.output_file, _OUTPUT_FLAGS, 0o644)
+            try:
+                _write_all(fd, blob)
+            finally:
+                os.close(fd)
             
             # Save heading map for reference
             self.save_heading_map()
@@ -331,51 +435,42 @@ class BrakeRequirementsConverter:
             self.print_success("Conversion completed successfully!")
             self.print_info(f"Output saved to: {self.output_file}")
             
-            # Print statistics
+            # Build the report and write it to stdout in one call
+            report = []
+            append = report.append
+            append("\n📊 Statistics:\n")
             if TABULATE_AVAILABLE:
                 stats_table = [
-                    ["Total work items", output['metadata']['total_items']],
-                    ["Requirements", output['metadata']['total_requirements']]
+                    ["Total work items", total_items],
+                    ["Requirements", total_requirements]
                 ]
-                print("\n📊 Statistics:")
-                print(tabulate(stats_table, headers=["Metric", "Count"], tablefmt="grid"))
+                append(tabulate(stats_table, headers=["Metric", "Count"], tablefmt="grid") + "\n")
             else:
-                print("\n📊 Statistics:")
-                print(f"   - Total work items: {output['metadata']['total_items']}")
-                print(f"   - Requirements: {output['metadata']['total_requirements']}")
-            
-            # Print category breakdown
-            categories = {}
-            for item in self.work_items:
-                if item["type"] == "requirement":
-                    cat = item["custom_fields"]["category"]
-                    categories[cat] = categories.get(cat, 0) + 1
+                append(f"   - Total work items: {total_items}\n")
+                append(f"   - Requirements: {total_requirements}\n")
             
+            # Category breakdown
             if categories:
-                print("\n📂 Requirements by Category:")
+                append("\n📂 Requirements by Category:\n")
                 if TABULATE_AVAILABLE:
                     cat_table = [[cat, count] for cat, count in sorted(categories.items())]
-                    print(tabulate(cat_table, headers=["Category", "Count"], tablefmt="grid"))
+                    append(tabulate(cat_table, headers=["Category", "Count"], tablefmt="grid") + "\n")
                 else:
                     for cat, count in sorted(categories.items()):
-                        print(f"   - {cat}: {count}")
+                        append(f"   - {cat}: {count}\n")
             
-            # Print heading references used
-            heading_refs = {}
-            for item in self.work_items:
-                if "links" in item:
-                    for link in item["links"]:
-                        if link["role"] == "has_parent":
-                            heading_id = link["target_id"]
-                            heading_refs[heading_id] = heading_refs.get(heading_id, 0) + 1
-            
-            print("\n🔗 Referenced Heading IDs:")
+            # Heading references used
+            append("\n🔗 Referenced Heading IDs:\n")
             if TABULATE_AVAILABLE:
-                ref_table = [[hid, count] for hid, count in sorted(heading_refs.items())]
-                print(tabulate(ref_table, headers=["Heading ID", "References"], tablefmt="grid"))
+                ref_table = [[hid, count] for hid, count in
+                             sorted(heading_refs.items(), key=operator.itemgetter(0))]
+                append(tabulate(ref_table, headers=["Heading ID", "References"], tablefmt="grid") + "\n")
             else:
-                for hid, count in sorted(heading_refs.items()):
-                    print(f"   - {hid}: {count} references")
+                for hid, count in sorted(heading_refs.items(), key=operator.itemgetter(0)):
+                    append(f"   - {hid}: {count} references\n")
+            
+            sys.stdout.write("".join(report))
+            sys.stdout.flush()
                         
         except FileNotFoundError as e:
             self.print_error(f"File not found: {e}")
@@ -404,6 +499,7 @@ Examples:
   %(prog)s
   %(prog)s -i custom_input.json -o custom_output.json
   %(prog)s --heading-map heading_ids.json
+  %(prog)s --compact
   %(prog)s --validate-only
         """
     )
@@ -425,6 +521,12 @@ Examples:
         help="JSON file with custom heading ID mappings"
     )
     
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write output JSON without indentation (smaller and faster to write)"
+    )
+    
     parser.add_argument(
         "--validate-only",
         action="store_true",
@@ -433,7 +535,7 @@ Examples:
     
     args = parser.parse_args()
     
-    converter = BrakeRequirementsConverter(args.input, args.output, args.heading_map)
+    converter = BrakeRequirementsConverter(args.input, args.output, args.heading_map, args.compact)
     
     if args.validate_only:
         try:
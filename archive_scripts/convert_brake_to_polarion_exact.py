@@ -4,89 +4,245 @@ Convert brake_system_requirements to exact Polarion format matching workitem_wit
 Maps requirements to existing work items in Python/_default/Functional Concept - Template
 """
 
+import argparse
+import functools
 import json
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator
+
+try:
+    from jsonschema import Draft7Validator
+    JSONSCHEMA_AVAILABLE = True
+except ImportError:
+    JSONSCHEMA_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Shared stand-in for missing attribute dicts; never mutated
+_EMPTY = {}
+
+# Requirement priority -> Polarion priority
+_PRIORITY_MAP = {
+    "Critical": "high",
+    "High": "high",
+    "Medium": "medium",
+    "Low": "low"
+}
+
+# Requirement category -> Polarion severity; critical safety requirements
+# are raised to _SEVERITY_SAFETY_CRITICAL
+_SEVERITY_MAP = {
+    "Safety": "must_have",
+    "Functional": "must_have",
+    "Performance": "must_have",
+    "Interface": "should_have",
+    "Environmental": "should_have",
+    "Maintenance": "could_have",
+    "Regulatory": "must_have",
+    "Testing": "should_have"
+}
+_SEVERITY_SAFETY_CRITICAL = "safety_critical"
+
+# Fixed work item strings, interned once and shared by every generated item
+_T_REQ = sys.intern("requirement")
+_T_HTML = sys.intern("text/html")
+_T_DRAFT = sys.intern("draft")
+_T_DOCS = sys.intern("documents")
+
+# Requirements are converted in worker processes only from this many on;
+# below it process start-up dominates
+_PARALLEL_MIN_REQUIREMENTS = 1000
+_PARALLEL_CHUNK_SIZE = 64
+
+# Keys every generated work item carries
+_WORK_ITEM_SCHEMA = {
+    "type": "object",
+    "required": ["type", "title", "description", "status", "severity", "priority", "relationships"]
+}
+
+_LINK_SCHEMA = {
+    "type": "object",
+    "required": ["target_id", "role", "description"]
+}
+
+# Shape of the converted output, matching workitem_with_links.json
+_OUTPUT_SCHEMA = {
+    "type": "object",
+    "required": ["work_item", "links", "children"],
+    "properties": {
+        "work_item": {"anyOf": [{"type": "null"}, _WORK_ITEM_SCHEMA]},
+        "links": {"type": "array", "items": _LINK_SCHEMA},
+        "children": {"type": "array", "items": _WORK_ITEM_SCHEMA}
+    }
+}
+
+# Checked once at import so validation is a single pass over the output
+_OUTPUT_VALIDATOR = Draft7Validator(_OUTPUT_SCHEMA) if JSONSCHEMA_AVAILABLE else None
+
+def _mapping_rule(keywords: tuple, preferred: tuple) -> Dict:
+    """Build a parent mapping rule with its keywords also as a set for whole-word tests"""
+    return {"keywords": keywords, "keywords_set": frozenset(keywords), "preferred": preferred}
+
+# Requirement category -> title keywords and preferred parent work items
+_MAPPING_RULES = {
+    "functional": _mapping_rule(
+        ("mcp", "framework", "integration", "server", "composite"),
+        ("Python/FCTS-9156", "Python/FCTS-9157", "Python/FCTS-9158")),
+    "safety": _mapping_rule(
+        ("safety", "goal", "critical"),
+        ("Python/FCTS-9155",)),
+    "testing": _mapping_rule(
+        ("test", "validation", "verification"),
+        ("Python/FCTS-9159", "Python/FCTS-9160", "Python/FCTS-9179", "Python/FCTS-9180")),
+    "interface": _mapping_rule(
+        ("interface", "communication", "integration"),
+        ("Python/FCTS-9158", "Python/FCTS-9173")),
+    "performance": _mapping_rule(
+        ("performance", "response", "efficiency"),
+        ("Python/FCTS-9175", "Python/FCTS-9178")),
+}
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes with orjson if available, otherwise stdlib json"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes with orjson if available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+def _dumps_nested(obj: Any, depth: int) -> bytes:
+    """Serialize obj as indented JSON for embedding at the given nesting depth"""
+    return _dumps(obj).replace(b"\n", b"\n" + b"  " * depth)
+
+def _write_array(f, items, depth: int) -> None:
+    """Write items as an indented JSON array nested at depth, one item at a time"""
+    indent = b"\n" + b"  " * (depth + 1)
+    separator = b"["
+    for item in items:
+        f.write(separator + indent)
+        f.write(_dumps_nested(item, depth + 1))
+        separator = b","
+    f.write(b"[]" if separator == b"[" else b"\n" + b"  " * depth + b"]")
+
+def _write_streamed(f, obj: Dict) -> None:
+    """Write a dict as indented JSON, streaming list values item by item"""
+    separator = b"{\n  "
+    for key, value in obj.items():
+        f.write(separator + _dumps(key) + b": ")
+        if isinstance(value, list):
+            _write_array(f, value, 1)
+        else:
+            f.write(_dumps_nested(value, 1))
+        separator = b",\n  "
+    f.write(b"{}" if separator == b"{\n  " else b"\n}")
 
 class PolarionExactConverter:
     def __init__(self):
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.document_id = "Python/_default/Functional Concept - Template"
+        self.document_id = sys.intern("Python/_default/Functional Concept - Template")
         self.existing_workitems = {}
         self.work_items = []
+        # Shared by every work item of the current document; see module_relationship
+        self._module_rel = None
+        # Output format checks are informational and off by default
+        self.validate = False
+        # Existing work item ID -> title, used for parent link descriptions
+        self._parent_title = {}
+        # Requirements sharing a category and title always map to the same
+        # parent; cleared whenever existing work items are reloaded
+        self.map_category_title_to_parent = functools.lru_cache(maxsize=None)(
+            self._map_category_title_to_parent)
         
     def load_project_analysis(self, file_path: str) -> Dict:
         """Load the project analysis to get existing work items"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            # Stream documents one at a time when ijson is available so only
+            # the matching document is ever fully materialized
+            if IJSON_AVAILABLE:
+                documents = ijson.items(f, "documents.item", use_float=True)
+            else:
+                documents = _loads(f.read()).get("documents", [])
             
-        # Find the Functional Concept Template document
-        for doc in data.get("documents", []):
-            if doc.get("id") == self.document_id:
+            # Find the Functional Concept Template document
+            for doc in documents:
+                if doc.get("id") != self.document_id:
+                    continue
+                
                 # Extract work items from structure_analysis
+                self.map_category_title_to_parent.cache_clear()
                 if "structure_analysis" in doc and "work_items" in doc["structure_analysis"]:
-                    for item in doc["structure_analysis"]["work_items"]["data"]:
-                        item_id = item.get("id")
-                        item_type = item.get("attributes", {}).get("type")
-                        item_title = item.get("attributes", {}).get("title", "")
-                        
-                        self.existing_workitems[item_id] = {
-                            "type": item_type,
-                            "title": item_title,
-                            "attributes": item.get("attributes", {})
+                    self.existing_workitems = {
+                        item.get("id"): {
+                            "type": (attrs := item.get("attributes") or _EMPTY).get("type"),
+                            "title": attrs.get("title", ""),
+                            "attributes": attrs
                         }
+                        for item in doc["structure_analysis"]["work_items"]["data"]
+                    }
+                self._parent_title = {wid: data["title"] for wid, data in self.existing_workitems.items()}
                 return doc
         return None
     
+    def module_relationship(self) -> Dict:
+        """Return the module relationship shared by all work items of the current document"""
+        # document_id may be reassigned after construction, so rebuild on change
+        if self._module_rel is None or self._module_rel["module"]["data"]["id"] != self.document_id:
+            self._module_rel = {
+                "module": {
+                    "data": {
+                        "type": _T_DOCS,
+                        "id": self.document_id
+                    }
+                }
+            }
+        return self._module_rel
+    
     def load_brake_requirements(self, file_path: str) -> Dict:
         """Load the structured brake requirements"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return _loads(f.read())
     
     def map_requirement_to_parent(self, requirement: Dict) -> str:
         """
         Map a brake requirement to the most appropriate existing work item
         Based on category and content matching
         """
-        category = requirement.get("category", "").lower()
-        title = requirement.get("title", "").lower()
-        
-        # Define mapping rules based on category and keywords
-        mapping_rules = {
-            "functional": {
-                "keywords": ["mcp", "framework", "integration", "server", "composite"],
-                "preferred": ["Python/FCTS-9156", "Python/FCTS-9157", "Python/FCTS-9158"]
-            },
-            "safety": {
-                "keywords": ["safety", "goal", "critical"],
-                "preferred": ["Python/FCTS-9155"]
-            },
-            "testing": {
-                "keywords": ["test", "validation", "verification"],
-                "preferred": ["Python/FCTS-9159", "Python/FCTS-9160", "Python/FCTS-9179", "Python/FCTS-9180"]
-            },
-            "interface": {
-                "keywords": ["interface", "communication", "integration"],
-                "preferred": ["Python/FCTS-9158", "Python/FCTS-9173"]
-            },
-            "performance": {
-                "keywords": ["performance", "response", "efficiency"],
-                "preferred": ["Python/FCTS-9175", "Python/FCTS-9178"]
-            }
-        }
+        return self.map_category_title_to_parent(requirement.get("category", ""),
+                                                 requirement.get("title", ""))
+    
+    def _map_category_title_to_parent(self, category: str, title: str) -> str:
+        """Map a requirement category and title to an existing work item"""
+        category = category.lower()
+        title = title.lower()
         
         # Try to find best match based on category
-        if category in mapping_rules:
-            rule = mapping_rules[category]
-            # Check if any keyword matches in title
-            for keyword in rule["keywords"]:
-                if keyword in title:
-                    # Return first available preferred parent
-                    for parent_id in rule["preferred"]:
-                        if parent_id in self.existing_workitems:
-                            return parent_id
+        rule = _MAPPING_RULES.get(category)
+        if rule is not None:
+            # Check if any keyword matches in title: whole words through a C-level
+            # set test first, then substrings (e.g. "test" in "testing")
+            if (not rule["keywords_set"].isdisjoint(title.split())
+                    or any(keyword in title for keyword in rule["keywords"])):
+                # Return first available preferred parent
+                for parent_id in rule["preferred"]:
+                    if parent_id in self.existing_workitems:
+                        return parent_id
         
         # Default fallback - use the parent requirement
         if "Python/FCTS-9156" in self.existing_workitems:
@@ -103,42 +259,23 @@ class PolarionExactConverter:
         """Create work item in exact format matching workitem_with_links.json"""
         
         # Map priority and severity
-        priority_map = {
-            "Critical": "high",
-            "High": "high", 
-            "Medium": "medium",
-            "Low": "low"
-        }
-        
-        severity_map = {
-            "Safety": "safety_critical" if requirement.get("priority") == "Critical" else "must_have",
-            "Functional": "must_have",
-            "Performance": "must_have",
-            "Interface": "should_have",
-            "Environmental": "should_have",
-            "Maintenance": "could_have",
-            "Regulatory": "must_have",
-            "Testing": "should_have"
-        }
+        category = requirement.get("category", "Functional")
+        if category == "Safety" and requirement.get("priority") == "Critical":
+            severity = _SEVERITY_SAFETY_CRITICAL
+        else:
+            severity = _SEVERITY_MAP.get(category, "must_have")
         
         workitem = {
-            "type": "requirement",
-            "title": f"{requirement['title']} {self.timestamp}",
+            "type": _T_REQ,
+            "title": requirement["title"] + " " + self.timestamp,
             "description": {
-                "type": "text/html",
+                "type": _T_HTML,
                 "value": f"<p>{requirement['description']}</p>"
             },
-            "status": "draft",
-            "severity": severity_map.get(requirement.get("category", "Functional"), "must_have"),
-            "priority": priority_map.get(requirement.get("priority", "Medium"), "medium"),
-            "relationships": {
-                "module": {
-                    "data": {
-                        "type": "documents",
-                        "id": self.document_id
-                    }
-                }
-            }
+            "status": _T_DRAFT,
+            "severity": severity,
+            "priority": _PRIORITY_MAP.get(requirement.get("priority", "Medium"), "medium"),
+            "relationships": self.module_relationship()
         }
         
         return workitem
@@ -149,7 +286,7 @@ class PolarionExactConverter:
             {
                 "target_id": parent_id,
                 "role": "has_parent",
-                "description": f"Links to {self.existing_workitems.get(parent_id, {}).get('title', 'parent requirement')}"
+                "description": f"Links to {self._parent_title.get(parent_id, 'parent requirement')}"
             }
         ]
         
@@ -172,6 +309,19 @@ class PolarionExactConverter:
         
         return links
     
+    def convert_requirement(self, requirement: Dict) -> Dict:
+        """Convert one requirement to a work item under its mapped parent"""
+        return self.create_workitem_exact_format(requirement, self.map_requirement_to_parent(requirement))
+    
+    def iter_requirements(self, brake_data: Dict) -> Iterator[Dict]:
+        """Yield all requirements from chapters and subchapters in document order"""
+        document = brake_data.get("document", {})
+        for chapter in document.get("chapters", []):
+            # Direct workitems, then subchapter workitems
+            yield from chapter.get("workitems") or ()
+            for subchapter in chapter.get("subchapters", []):
+                yield from subchapter.get("workitems") or ()
+    
     def convert_requirements(self, brake_data: Dict) -> Dict:
         """Convert all brake requirements to Polarion format"""
         output = {
@@ -180,31 +330,11 @@ class PolarionExactConverter:
             "children": []
         }
         
-        document = brake_data.get("document", {})
-        all_requirements = []
-        
-        # Extract all requirements from chapters
-        for chapter in document.get("chapters", []):
-            # Process direct workitems
-            if "workitems" in chapter:
-                all_requirements.extend(chapter["workitems"])
-            
-            # Process subchapter workitems
-            for subchapter in chapter.get("subchapters", []):
-                if "workitems" in subchapter:
-                    all_requirements.extend(subchapter["workitems"])
-        
-        # Group requirements by category for better organization
-        categorized = {}
-        for req in all_requirements:
-            category = req.get("category", "Uncategorized")
-            if category not in categorized:
-                categorized[category] = []
-            categorized[category].append(req)
+        requirements = self.iter_requirements(brake_data)
         
         # Create main parent work item (first requirement acts as parent)
-        if all_requirements:
-            first_req = all_requirements[0]
+        first_req = next(requirements, None)
+        if first_req is not None:
             parent_id = self.map_requirement_to_parent(first_req)
             
             # Create main work item
@@ -212,10 +342,15 @@ class PolarionExactConverter:
             output["links"] = self.create_links(first_req, parent_id)
             
             # Add rest as children
-            for req in all_requirements[1:]:
-                child_parent_id = self.map_requirement_to_parent(req)
-                child_workitem = self.create_workitem_exact_format(req, child_parent_id)
-                output["children"].append(child_workitem)
+            remaining = list(requirements)
+            if len(remaining) >= _PARALLEL_MIN_REQUIREMENTS:
+                with ProcessPoolExecutor(
+                        initializer=_init_worker,
+                        initargs=(self.document_id, self.timestamp, self.existing_workitems)) as executor:
+                    output["children"] = list(executor.map(
+                        _convert_requirement_worker, remaining, chunksize=_PARALLEL_CHUNK_SIZE))
+            else:
+                output["children"] = [self.convert_requirement(req) for req in remaining]
         
         return output
     
@@ -244,8 +379,10 @@ class PolarionExactConverter:
         output = self.convert_requirements(brake_data)
         
         # Save output
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+        # Work item lists are serialized one item at a time rather than as a
+        # single document-sized string
+        with open(output_path, 'wb') as f:
+            _write_streamed(f, output)
         
         print(f"✅ Output saved to: {output_path}")
         print(f"📊 Statistics:")
@@ -254,12 +391,23 @@ class PolarionExactConverter:
         print(f"   - Links created: {len(output.get('links', []))}")
         
         # Validate format
-        self.validate_output_format(output)
+        if self.validate:
+            self.validate_output_format(output)
     
     def validate_output_format(self, output: Dict):
         """Validate that output matches exact format of workitem_with_links.json"""
         print("\n🔍 Validating output format...")
         
+        if _OUTPUT_VALIDATOR is not None:
+            errors = list(_OUTPUT_VALIDATOR.iter_errors(output))
+            for error in errors:
+                location = "/".join(str(part) for part in error.absolute_path) or "output"
+                print(f"   ❌ {location}: {error.message}")
+            if not errors:
+                print("   ✅ Output matches expected format")
+            print("\n✅ Format validation complete!")
+            return
+        
         required_keys = ["work_item", "links", "children"]
         for key in required_keys:
             if key not in output:
@@ -286,9 +434,32 @@ class PolarionExactConverter:
         
         print("\n✅ Format validation complete!")
 
+# Converter holding the parent's loaded state in a worker process
+_worker_converter = None
+
+def _init_worker(document_id: str, timestamp: str, existing_workitems: Dict):
+    """Set up the worker process converter from the parent's loaded state"""
+    global _worker_converter
+    _worker_converter = PolarionExactConverter()
+    _worker_converter.document_id = document_id
+    _worker_converter.timestamp = timestamp
+    _worker_converter.existing_workitems = existing_workitems
+
+def _convert_requirement_worker(requirement: Dict) -> Dict:
+    """Convert one requirement in a worker process"""
+    return _worker_converter.convert_requirement(requirement)
+
 def main():
     """Main entry point with interactive document selection"""
     
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Check the generated output format after conversion"
+    )
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("🚀 Brake Requirements to Polarion Converter")
     print("=" * 60)
@@ -312,7 +483,8 @@ def main():
     
     # Create converter and run
     converter = PolarionExactConverter()
-    converter.document_id = doc_id
+    converter.document_id = sys.intern(doc_id)
+    converter.validate = args.validate
     converter.run(project_analysis, brake_requirements, output_file)
 
 if __name__ == "__main__":
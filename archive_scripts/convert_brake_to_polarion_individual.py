@@ -4,46 +4,284 @@ Convert brake_system_requirements to individual Polarion work items
 Each requirement becomes a separate work item with links to matching headings
 """
 
+import argparse
+import functools
 import json
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+
+try:
+    from jsonschema import Draft7Validator
+    JSONSCHEMA_AVAILABLE = True
+except ImportError:
+    JSONSCHEMA_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Leading outline number of a heading, e.g. "3. " or "3.1 "
+_NUM_PREFIX_RE = re.compile(r'^\d+\.?\d*\s+')
+
+# Shared stand-in for missing attribute dicts; never mutated
+_EMPTY = {}
+
+# Requirement priority -> Polarion priority
+_PRIORITY_MAP = {
+    "Critical": "high",
+    "High": "high",
+    "Medium": "medium",
+    "Low": "low"
+}
+
+# Requirement category -> Polarion severity; critical safety requirements
+# are raised to _SEVERITY_SAFETY_CRITICAL
+_SEVERITY_MAP = {
+    "Safety": "must_have",
+    "Functional": "must_have",
+    "Performance": "must_have",
+    "Interface": "should_have",
+    "Environmental": "should_have",
+    "Maintenance": "could_have",
+    "Regulatory": "must_have",
+    "Testing": "should_have"
+}
+_SEVERITY_SAFETY_CRITICAL = "safety_critical"
+
+# Fixed work item strings, interned once and shared by every generated item
+_T_REQ = sys.intern("requirement")
+_T_HTML = sys.intern("text/html")
+_T_DRAFT = sys.intern("draft")
+_T_DOCS = sys.intern("documents")
+
+# Requirements are converted in worker processes only from this many on;
+# below it process start-up dominates
+_PARALLEL_MIN_REQUIREMENTS = 1000
+_PARALLEL_CHUNK_SIZE = 64
+
+# Keys every generated work item carries
+_WORK_ITEM_SCHEMA = {
+    "type": "object",
+    "required": ["type", "title", "description", "status", "severity", "priority", "relationships"]
+}
+
+_LINK_SCHEMA = {
+    "type": "object",
+    "required": ["target_id", "role", "description"]
+}
+
+# Shape of the converted output: standalone work items with parent links
+_OUTPUT_SCHEMA = {
+    "type": "array",
+    "minItems": 1,
+    "items": {
+        "type": "object",
+        "required": ["work_item", "links", "children"],
+        "properties": {
+            "work_item": _WORK_ITEM_SCHEMA,
+            "links": {"type": "array", "items": _LINK_SCHEMA},
+            "children": {"type": "array", "maxItems": 0}
+        }
+    }
+}
+
+# Checked once at import so validation is a single pass over the output
+_OUTPUT_VALIDATOR = Draft7Validator(_OUTPUT_SCHEMA) if JSONSCHEMA_AVAILABLE else None
+
+# Heading keyword -> candidate work items, checked in this order; mapping
+# rules based on chapter content
+_HEADING_MAP = {
+    # Functional chapters
+    "functional": ("Python/FCTS-9156", "Python/FCTS-9157", "Python/FCTS-9158"),
+    "primary": ("Python/FCTS-9157",),  # Proto-Server for primary functions
+    "advanced": ("Python/FCTS-9158",),  # Composite-Server for advanced
+    "brake function": ("Python/FCTS-9156", "Python/FCTS-9157"),
+    
+    # Performance chapters
+    "performance": ("Python/FCTS-9175", "Python/FCTS-9178"),
+    "stopping": ("Python/FCTS-9175",),
+    "response": ("Python/FCTS-9178",),
+    "durability": ("Python/FCTS-9175",),
+    
+    # Safety chapters
+    "safety": ("Python/FCTS-9155",),
+    "redundancy": ("Python/FCTS-9155",),
+    "monitoring": ("Python/FCTS-9155",),
+    "warning": ("Python/FCTS-9155",),
+    
+    # Interface chapters
+    "interface": ("Python/FCTS-9173", "Python/FCTS-9158"),
+    "communication": ("Python/FCTS-9173",),
+    "integration": ("Python/FCTS-9158", "Python/FCTS-9173"),
+    "sensor": ("Python/FCTS-9173",),
+    
+    # Environmental chapters
+    "environmental": ("Python/FCTS-9181", "Python/FCTS-9178"),
+    "temperature": ("Python/FCTS-9181",),
+    "corrosion": ("Python/FCTS-9181",),
+    
+    # Maintenance chapters
+    "maintenance": ("Python/FCTS-9167", "Python/FCTS-9168"),
+    "service": ("Python/FCTS-9167",),
+    "diagnostic": ("Python/FCTS-9168",),
+    
+    # Regulatory chapters
+    "regulatory": ("Python/FCTS-9156", "Python/FCTS-9155"),
+    "compliance": ("Python/FCTS-9156",),
+    "standard": ("Python/FCTS-9156",),
+    
+    # Testing chapters
+    "testing": ("Python/FCTS-9159", "Python/FCTS-9160", "Python/FCTS-9179", "Python/FCTS-9180"),
+    "verification": ("Python/FCTS-9159", "Python/FCTS-9179"),
+    "validation": ("Python/FCTS-9160", "Python/FCTS-9180"),
+    "test": ("Python/FCTS-9159", "Python/FCTS-9160")
+}
+
+def _build_heading_automaton():
+    """Build an Aho-Corasick automaton yielding (rule index, keyword) per keyword"""
+    automaton = ahocorasick.Automaton()
+    for index, keyword in enumerate(_HEADING_MAP):
+        automaton.add_word(keyword, (index, keyword))
+    automaton.make_automaton()
+    return automaton
+
+# Matches all heading keywords in a single pass over a heading
+_HEADING_AUTOMATON = _build_heading_automaton() if AHOCORASICK_AVAILABLE else None
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes with orjson if available, otherwise stdlib json"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes with orjson if available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+def _dumps_nested(obj: Any, depth: int) -> bytes:
+    """Serialize obj as indented JSON for embedding at the given nesting depth"""
+    return _dumps(obj).replace(b"\n", b"\n" + b"  " * depth)
+
+def _write_array(f, items, depth: int) -> None:
+    """Write items as an indented JSON array nested at depth, one item at a time"""
+    indent = b"\n" + b"  " * (depth + 1)
+    separator = b"["
+    for item in items:
+        f.write(separator + indent)
+        f.write(_dumps_nested(item, depth + 1))
+        separator = b","
+    f.write(b"[]" if separator == b"[" else b"\n" + b"  " * depth + b"]")
+
+def _write_streamed(f, obj: Dict) -> None:
+    """Write a dict as indented JSON, streaming list values item by item"""
+    separator = b"{\n  "
+    for key, value in obj.items():
+        f.write(separator + _dumps(key) + b": ")
+        if isinstance(value, list):
+            _write_array(f, value, 1)
+        else:
+            f.write(_dumps_nested(value, 1))
+        separator = b",\n  "
+    f.write(b"{}" if separator == b"{\n  " else b"\n}")
 
 class PolarionIndividualConverter:
     def __init__(self):
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.document_id = "Python/_default/Functional Concept - Template"
+        self.document_id = sys.intern("Python/_default/Functional Concept - Template")
         self.existing_workitems = {}
         self.work_items = []
+        # Shared by every work item of the current document; see module_relationship
+        self._module_rel = None
+        # Output format checks are informational and off by default
+        self.validate = False
+        # Existing work item ID -> title, used for parent link descriptions
+        self._parent_title = {}
+        # Heading keyword -> first of its candidate work items that exists,
+        # rebuilt by compile_keyword_map after loading
+        self._keyword_to_parent = {}
+        # Many requirements share a chapter/subchapter; cleared whenever
+        # existing work items are reloaded
+        self.match_heading_to_workitem = functools.lru_cache(maxsize=None)(
+            self._match_heading_to_workitem)
         
     def load_project_analysis(self, file_path: str) -> Dict:
         """Load the project analysis to get existing work items"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(file_path, 'rb') as f:
+            # Stream documents one at a time when ijson is available so only
+            # the matching document is ever fully materialized
+            if IJSON_AVAILABLE:
+                documents = ijson.items(f, "documents.item", use_float=True)
+            else:
+                documents = _loads(f.read()).get("documents", [])
             
-        # Find the Functional Concept Template document
-        for doc in data.get("documents", []):
-            if doc.get("id") == self.document_id:
+            # Find the Functional Concept Template document
+            for doc in documents:
+                if doc.get("id") != self.document_id:
+                    continue
+                
                 # Extract work items from structure_analysis
+                self.match_heading_to_workitem.cache_clear()
                 if "structure_analysis" in doc and "work_items" in doc["structure_analysis"]:
-                    for item in doc["structure_analysis"]["work_items"]["data"]:
-                        item_id = item.get("id")
-                        item_type = item.get("attributes", {}).get("type")
-                        item_title = item.get("attributes", {}).get("title", "")
-                        
-                        self.existing_workitems[item_id] = {
-                            "type": item_type,
-                            "title": item_title,
-                            "attributes": item.get("attributes", {})
+                    self.existing_workitems = {
+                        item.get("id"): {
+                            "type": (attrs := item.get("attributes") or _EMPTY).get("type"),
+                            "title": attrs.get("title", ""),
+                            "attributes": attrs
                         }
+                        for item in doc["structure_analysis"]["work_items"]["data"]
+                    }
+                self._parent_title = {wid: data["title"] for wid, data in self.existing_workitems.items()}
+                self.compile_keyword_map()
                 return doc
         return None
     
+    def compile_keyword_map(self):
+        """Resolve each heading keyword to its first existing candidate work item"""
+        self._keyword_to_parent = {}
+        for keyword, workitem_ids in _HEADING_MAP.items():
+            for wid in workitem_ids:
+                if wid in self.existing_workitems:
+                    self._keyword_to_parent[keyword] = wid
+                    break
+    
+    def module_relationship(self) -> Dict:
+        """Return the module relationship shared by all work items of the current document"""
+        # document_id may be reassigned after construction, so rebuild on change
+        if self._module_rel is None or self._module_rel["module"]["data"]["id"] != self.document_id:
+            self._module_rel = {
+                "module": {
+                    "data": {
+                        "type": _T_DOCS,
+                        "id": self.document_id
+                    }
+                }
+            }
+        return self._module_rel
+    
     def load_brake_requirements(self, file_path: str) -> Dict:
         """Load the structured brake requirements"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return _loads(f.read())
     
     def extract_requirements_with_context(self, brake_data: Dict) -> List[Tuple[Dict, str, str]]:
         """
@@ -70,127 +308,68 @@ class PolarionIndividualConverter:
         
         return requirements_with_context
     
-    def match_heading_to_workitem(self, chapter: str, subchapter: Optional[str] = None) -> str:
+    def _match_heading_to_workitem(self, chapter: str, subchapter: Optional[str] = None) -> str:
         """
         Match a chapter/subchapter heading to the most appropriate existing work item
         """
         # Clean chapter/subchapter titles (remove numbering)
-        import re
-        chapter_clean = re.sub(r'^\d+\.?\d*\s+', '', chapter).lower()
-        subchapter_clean = re.sub(r'^\d+\.?\d*\s+', '', subchapter).lower() if subchapter else ""
-        
-        # Mapping rules based on chapter content
-        heading_map = {
-            # Functional chapters
-            "functional": ["Python/FCTS-9156", "Python/FCTS-9157", "Python/FCTS-9158"],
-            "primary": ["Python/FCTS-9157"],  # Proto-Server for primary functions
-            "advanced": ["Python/FCTS-9158"],  # Composite-Server for advanced
-            "brake function": ["Python/FCTS-9156", "Python/FCTS-9157"],
-            
-            # Performance chapters
-            "performance": ["Python/FCTS-9175", "Python/FCTS-9178"],
-            "stopping": ["Python/FCTS-9175"],
-            "response": ["Python/FCTS-9178"],
-            "durability": ["Python/FCTS-9175"],
-            
-            # Safety chapters
-            "safety": ["Python/FCTS-9155"],
-            "redundancy": ["Python/FCTS-9155"],
-            "monitoring": ["Python/FCTS-9155"],
-            "warning": ["Python/FCTS-9155"],
-            
-            # Interface chapters
-            "interface": ["Python/FCTS-9173", "Python/FCTS-9158"],
-            "communication": ["Python/FCTS-9173"],
-            "integration": ["Python/FCTS-9158", "Python/FCTS-9173"],
-            "sensor": ["Python/FCTS-9173"],
-            
-            # Environmental chapters
-            "environmental": ["Python/FCTS-9181", "Python/FCTS-9178"],
-            "temperature": ["Python/FCTS-9181"],
-            "corrosion": ["Python/FCTS-9181"],
-            
-            # Maintenance chapters
-            "maintenance": ["Python/FCTS-9167", "Python/FCTS-9168"],
-            "service": ["Python/FCTS-9167"],
-            "diagnostic": ["Python/FCTS-9168"],
-            
-            # Regulatory chapters
-            "regulatory": ["Python/FCTS-9156", "Python/FCTS-9155"],
-            "compliance": ["Python/FCTS-9156"],
-            "standard": ["Python/FCTS-9156"],
-            
-            # Testing chapters
-            "testing": ["Python/FCTS-9159", "Python/FCTS-9160", "Python/FCTS-9179", "Python/FCTS-9180"],
-            "verification": ["Python/FCTS-9159", "Python/FCTS-9179"],
-            "validation": ["Python/FCTS-9160", "Python/FCTS-9180"],
-            "test": ["Python/FCTS-9159", "Python/FCTS-9160"]
-        }
+        chapter_clean = _NUM_PREFIX_RE.sub('', chapter).lower()
+        subchapter_clean = _NUM_PREFIX_RE.sub('', subchapter).lower() if subchapter else ""
         
-        # Try to match based on subchapter first (more specific)
-        if subchapter_clean:
-            for keyword, workitem_ids in heading_map.items():
-                if keyword in subchapter_clean:
-                    for wid in workitem_ids:
-                        if wid in self.existing_workitems:
-                            return wid
-        
-        # Then try chapter
-        for keyword, workitem_ids in heading_map.items():
-            if keyword in chapter_clean:
-                for wid in workitem_ids:
-                    if wid in self.existing_workitems:
-                        return wid
+        # Try to match based on subchapter first (more specific), then chapter
+        match = self.match_keywords(subchapter_clean) if subchapter_clean else None
+        if match is None:
+            match = self.match_keywords(chapter_clean)
         
         # Default fallback - use parent requirement
-        return "Python/FCTS-9156"
+        return match if match is not None else "Python/FCTS-9156"
+    
+    def match_keywords(self, heading: str) -> Optional[str]:
+        """
+        Return the first existing work item of the earliest-listed keyword
+        found in a cleaned heading, or None
+        """
+        keyword_to_parent = self._keyword_to_parent
+        if _HEADING_AUTOMATON is not None:
+            found = dict(hit for _, hit in _HEADING_AUTOMATON.iter(heading))
+            for index in sorted(found):
+                parent_id = keyword_to_parent.get(found[index])
+                if parent_id is not None:
+                    return parent_id
+            return None
+        
+        for keyword, parent_id in keyword_to_parent.items():
+            if keyword in heading:
+                return parent_id
+        return None
     
     def create_workitem_format(self, requirement: Dict, parent_id: str, 
                                chapter: str, subchapter: Optional[str]) -> Dict:
         """Create a single work item in exact Polarion format"""
         
         # Map priority and severity
-        priority_map = {
-            "Critical": "high",
-            "High": "high", 
-            "Medium": "medium",
-            "Low": "low"
-        }
-        
-        severity_map = {
-            "Safety": "safety_critical" if requirement.get("priority") == "Critical" else "must_have",
-            "Functional": "must_have",
-            "Performance": "must_have",
-            "Interface": "should_have",
-            "Environmental": "should_have",
-            "Maintenance": "could_have",
-            "Regulatory": "must_have",
-            "Testing": "should_have"
-        }
+        category = requirement.get("category", "Functional")
+        if category == "Safety" and requirement.get("priority") == "Critical":
+            severity = _SEVERITY_SAFETY_CRITICAL
+        else:
+            severity = _SEVERITY_MAP.get(category, "must_have")
         
         # Build description for linking context
         link_description = f"Links to {subchapter if subchapter else chapter}"
-        parent_title = self.existing_workitems.get(parent_id, {}).get('title', 'parent requirement')
+        parent_title = self._parent_title.get(parent_id, "parent requirement")
         
         workitem = {
             "work_item": {
-                "type": "requirement",
-                "title": f"{requirement['title']} {self.timestamp}",
+                "type": _T_REQ,
+                "title": requirement["title"] + " " + self.timestamp,
                 "description": {
-                    "type": "text/html",
+                    "type": _T_HTML,
                     "value": f"<p>{requirement['description']}</p>"
                 },
-                "status": "draft",
-                "severity": severity_map.get(requirement.get("category", "Functional"), "must_have"),
-                "priority": priority_map.get(requirement.get("priority", "Medium"), "medium"),
-                "relationships": {
-                    "module": {
-                        "data": {
-                            "type": "documents",
-                            "id": self.document_id
-                        }
-                    }
-                }
+                "status": _T_DRAFT,
+                "severity": severity,
+                "priority": _PRIORITY_MAP.get(requirement.get("priority", "Medium"), "medium"),
+                "relationships": self.module_relationship()
             },
             "links": [
                 {
@@ -219,12 +398,30 @@ class PolarionIndividualConverter:
                     workitem["links"].append({
                         "target_id": test_id,
                         "role": "verifies",
-                        "description": f"Verifies {self.existing_workitems[test_id]['title']}"
+                        "description": f"Verifies {self._parent_title[test_id]}"
                     })
                     break
         
         return workitem
     
+    def convert_requirement(self, requirement_with_context: Tuple[Dict, str, Optional[str]]) -> Tuple[Dict, str]:
+        """Convert one (requirement, chapter, subchapter) entry; returns the work item and its parent ID"""
+        req, chapter, subchapter = requirement_with_context
+        parent_id = self.match_heading_to_workitem(chapter, subchapter)
+        return self.create_workitem_format(req, parent_id, chapter, subchapter), parent_id
+    
+    def iter_converted(self, requirements_with_context: List[Tuple[Dict, str, Optional[str]]]) -> Iterator[Tuple[Dict, str]]:
+        """Yield (work item, parent ID) in input order, using worker processes for large inputs"""
+        if len(requirements_with_context) < _PARALLEL_MIN_REQUIREMENTS:
+            yield from map(self.convert_requirement, requirements_with_context)
+            return
+        
+        with ProcessPoolExecutor(
+                initializer=_init_worker,
+                initargs=(self.document_id, self.timestamp, self.existing_workitems)) as executor:
+            yield from executor.map(_convert_requirement_worker, requirements_with_context,
+                                    chunksize=_PARALLEL_CHUNK_SIZE)
+    
     def convert_requirements(self, brake_data: Dict) -> List[Dict]:
         """Convert all brake requirements to individual Polarion work items"""
         output_items = []
@@ -234,18 +431,17 @@ class PolarionIndividualConverter:
         
         print(f"\n📋 Processing {len(requirements_with_context)} requirements...")
         
-        # Process each requirement individually
-        for req, chapter, subchapter in requirements_with_context:
-            # Find matching work item for this requirement's context
-            parent_id = self.match_heading_to_workitem(chapter, subchapter)
-            
-            # Create individual work item
-            workitem = self.create_workitem_format(req, parent_id, chapter, subchapter)
+        # Process each requirement individually; progress lines are collected
+        # and written in one go after the loop
+        progress = []
+        converted = self.iter_converted(requirements_with_context)
+        for (req, _, _), (workitem, parent_id) in zip(requirements_with_context, converted):
             output_items.append(workitem)
             
-            # Debug output
-            context = f"{chapter} > {subchapter}" if subchapter else chapter
-            print(f"   ✅ {req['id']}: {req['title'][:30]}... → {parent_id}")
+            progress.append(f"   ✅ {req['id']}: {req['title'][:30]}... → {parent_id}\n")
+        
+        sys.stdout.write("".join(progress))
+        sys.stdout.flush()
         
         return output_items
     
@@ -285,8 +481,10 @@ class PolarionIndividualConverter:
         }
         
         # Save output
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+        # Work item lists are serialized one item at a time rather than as a
+        # single document-sized string
+        with open(output_path, 'wb') as f:
+            _write_streamed(f, output)
         
         print(f"\n✅ Output saved to: {output_path}")
         print(f"📊 Statistics:")
@@ -305,12 +503,23 @@ class PolarionIndividualConverter:
             print(f"   - {target}: {count} links ({target_title[:40]}...)")
         
         # Validate format
-        self.validate_output_format(output_items)
+        if self.validate:
+            self.validate_output_format(output_items)
     
     def validate_output_format(self, output_items: List[Dict]):
         """Validate that each output item matches exact format"""
         print("\n🔍 Validating output format...")
         
+        if _OUTPUT_VALIDATOR is not None:
+            errors = list(_OUTPUT_VALIDATOR.iter_errors(output_items))
+            for error in errors:
+                location = "/".join(str(part) for part in error.absolute_path) or "output"
+                print(f"   ❌ {location}: {error.message}")
+            if not errors:
+                print("   ✅ Output matches expected format")
+            print("\n✅ Format validation complete!")
+            return
+        
         if not output_items:
             print("   ❌ No work items generated")
             return
@@ -347,9 +556,34 @@ class PolarionIndividualConverter:
         
         print("\n✅ Format validation complete!")
 
+# Converter holding the parent's loaded state in a worker process
+_worker_converter = None
+
+def _init_worker(document_id: str, timestamp: str, existing_workitems: Dict):
+    """Set up the worker process converter from the parent's loaded state"""
+    global _worker_converter
+    _worker_converter = PolarionIndividualConverter()
+    _worker_converter.document_id = document_id
+    _worker_converter.timestamp = timestamp
+    _worker_converter.existing_workitems = existing_workitems
+    _worker_converter._parent_title = {wid: data["title"] for wid, data in existing_workitems.items()}
+    _worker_converter.compile_keyword_map()
+
+def _convert_requirement_worker(requirement_with_context: Tuple[Dict, str, Optional[str]]) -> Tuple[Dict, str]:
+    """Convert one requirement in a worker process"""
+    return _worker_converter.convert_requirement(requirement_with_context)
+
 def main():
     """Main entry point"""
     
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Check the generated output format after conversion"
+    )
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("🚀 Brake Requirements to Individual Polarion Work Items")
     print("=" * 60)
@@ -373,7 +607,8 @@ def main():
     
     # Create converter and run
     converter = PolarionIndividualConverter()
-    converter.document_id = doc_id
+    converter.document_id = sys.intern(doc_id)
+    converter.validate = args.validate
     converter.run(project_analysis, brake_requirements, output_file)
 
 if __name__ == "__main__":
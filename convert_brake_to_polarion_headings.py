@@ -5,41 +5,204 @@ with proper heading links using has_parent relationships.
 Each requirement links to its chapter/subchapter heading via has_parent.
 """
 
+import io
 import json
+import os
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes with orjson or msgspec if available, otherwise stdlib json"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    if MSGSPEC_AVAILABLE:
+        return msgspec.json.decode(data)
+    return json.loads(data)
+
+def _dumps(obj: Any, compact: bool = False) -> bytes:
+    """Serialize to indented (or compact) UTF-8 JSON bytes with orjson or msgspec if available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=0 if compact else orjson.OPT_INDENT_2)
+    if MSGSPEC_AVAILABLE:
+        data = msgspec.json.encode(obj)
+        return data if compact else msgspec.json.format(data, indent=2)
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serialize to one compact line of UTF-8 JSON, newline included"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return _dumps(obj, compact=True) + b"\n"
+
+def _dumps_nested(obj: Any, depth: int) -> bytes:
+    """Serialize obj as indented JSON for embedding at the given nesting depth"""
+    return _dumps(obj).replace(b"\n", b"\n" + b"  " * depth)
+
+def _write_array(f, items, depth: int) -> None:
+    """Write items as an indented JSON array nested at depth, one item at a time"""
+    indent = b"\n" + b"  " * (depth + 1)
+    separator = b"["
+    for item in items:
+        f.write(separator + indent)
+        f.write(_dumps_nested(item, depth + 1))
+        separator = b","
+    f.write(b"[]" if separator == b"[" else b"\n" + b"  " * depth + b"]")
+
+def _write_array_compact(f, items) -> None:
+    """Write items as a compact JSON array, one item at a time"""
+    separator = b"["
+    for item in items:
+        f.write(separator + _dumps(item, compact=True))
+        separator = b","
+    f.write(b"[]" if separator == b"[" else b"]")
+
+if MSGSPEC_AVAILABLE:
+    # Only the header fields used for the heading map are decoded; everything
+    # else in discovered_documents.json is skipped by the parser
+    class _Header(msgspec.Struct):
+        id: Any = None
+        title: Any = ""
+        outlineNumber: Any = ""
+
+    class _Structure(msgspec.Struct):
+        headers: List[_Header] = []
+
+    class _Document(msgspec.Struct):
+        structure: Optional[_Structure] = None
+
+    class _Discovered(msgspec.Struct):
+        documents: List[_Document] = []
+
+    _DISCOVERED_DECODER = msgspec.json.Decoder(_Discovered)
+
+# Shared default for absent chapter/subchapter/workitem lists; never mutated
+_EMPTY = ()
+
+# Requirement priority -> Polarion priority
+_PRIORITY_MAP = {
+    "Critical": "high",
+    "High": "high",
+    "Medium": "medium",
+    "Low": "low"
+}
+
+# Requirement category -> Polarion severity; critical safety requirements
+# are raised to _SEVERITY_SAFETY_CRITICAL
+_SEVERITY_MAP = {
+    "Safety": "must_have",
+    "Functional": "must_have",
+    "Performance": "must_have",
+    "Interface": "should_have",
+    "Environmental": "should_have",
+    "Maintenance": "could_have",
+    "Regulatory": "must_have",
+    "Testing": "should_have"
+}
+_SEVERITY_SAFETY_CRITICAL = "safety_critical"
+
+# (category, priority is "Critical") -> severity, folding the safety-critical
+# override into a single lookup
+_SEV = {
+    (category, critical): severity
+    for category, severity in _SEVERITY_MAP.items()
+    for critical in (False, True)
+}
+_SEV[("Safety", True)] = _SEVERITY_SAFETY_CRITICAL
+
+# Fixed work item strings, interned once and shared by every generated item
+_HAS_PARENT = sys.intern("has_parent")
+_REQ = sys.intern("requirement")
+_DRAFT = sys.intern("draft")
+_DOCS = sys.intern("documents")
+_HTML = sys.intern("text/html")
+
+# Chapters are converted in worker processes only for documents with at
+# least this many requirements; below it process start-up dominates
+_PARALLEL_MIN_REQUIREMENTS = 10000
 
 class PolarionHeadingConverter:
-    def __init__(self, document_id: Optional[str] = None):
+    def __init__(self, document_id: Optional[str] = None, verbose: bool = False,
+                 ndjson: bool = False, pretty: bool = False):
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         # Allow overriding the document ID via CLI; keep a sensible default
         self.document_id = document_id or "Python/_default/Functional Concept - Template"
         self.work_items = []
+        # Print one line per converted requirement
+        self.verbose = verbose
+        # Write JSON Lines (metadata line, then one work item per line)
+        self.ndjson = ndjson
+        # Indent the JSON output; compact output is smaller and faster to write
+        self.pretty = pretty
+        # Shared by every work item; it is only read when serializing
+        self._module_rel = {
+            "module": {
+                "data": {
+                    "type": _DOCS,
+                    "id": self.document_id
+                }
+            }
+        }
         
     def load_brake_requirements(self, file_path: str) -> Dict:
         """Load the structured brake requirements with heading IDs"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return _loads(Path(file_path).read_bytes())
     
     def load_discovered_documents(self, file_path: str) -> Dict[str, str]:
         """Load discovered documents to get heading titles"""
         heading_map = {}
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
+        if MSGSPEC_AVAILABLE:
+            discovered = _DISCOVERED_DECODER.decode(Path(file_path).read_bytes())
+            for doc in discovered.documents:
+                if doc.structure is not None:
+                    for header in doc.structure.headers:
+                        outline = header.outlineNumber
+                        title = header.title
+                        heading_map[header.id] = (outline + " " + title) if outline else title
+            return heading_map
+        
+        if SIMDJSON_AVAILABLE:
+            # Lazy proxy: only the header fields read below become Python
+            # objects; the parser (and its buffer) must stay alive while the
+            # proxies are used, so it is local to this call
+            parser = simdjson.Parser()
+            data = parser.parse(Path(file_path).read_bytes())
+        else:
+            data = _loads(Path(file_path).read_bytes())
+        
         # Extract heading information
         for doc in data.get("documents", []):
             if "structure" in doc and "headers" in doc["structure"]:
                 for header in doc["structure"]["headers"]:
-                    heading_id = header.get("id")
+                    # A missing or empty outline number leaves the bare title
+                    outline = header.get("outlineNumber")
                     title = header.get("title", "")
-                    outline = header.get("outlineNumber", "")
-                    if outline:
-                        heading_map[heading_id] = f"{outline} {title}"
-                    else:
-                        heading_map[heading_id] = title
+                    heading_map[header.get("id")] = (outline + " " + title) if outline else title
                         
         return heading_map
     
@@ -47,49 +210,32 @@ class PolarionHeadingConverter:
                                parent_heading_title: str) -> Dict:
         """Create a work item in exact Polarion format with heading link"""
         
-        # Map priority and severity
-        priority_map = {
-            "Critical": "high",
-            "High": "high", 
-            "Medium": "medium",
-            "Low": "low"
-        }
+        # Read each requirement field once
+        title = requirement["title"]
+        desc = requirement["description"]
+        prio_in = requirement.get("priority", "Medium")
+        cat = requirement.get("category", "Functional")
         
-        severity_map = {
-            "Safety": "safety_critical" if requirement.get("priority") == "Critical" else "must_have",
-            "Functional": "must_have",
-            "Performance": "must_have",
-            "Interface": "should_have",
-            "Environmental": "should_have",
-            "Maintenance": "could_have",
-            "Regulatory": "must_have",
-            "Testing": "should_have"
-        }
+        # Map severity
+        severity = _SEV.get((cat, prio_in == "Critical"), "must_have")
         
         workitem = {
             "work_item": {
-                "type": "requirement",
-                "title": f"{requirement['title']} {self.timestamp}",
+                "type": _REQ,
+                "title": f"{title} {self.timestamp}",
                 "description": {
-                    "type": "text/html",
-                    "value": f"<p>{requirement['description']}</p>"
+                    "type": _HTML,
+                    "value": f"<p>{desc}</p>"
                 },
-                "status": "draft",
-                "severity": severity_map.get(requirement.get("category", "Functional"), "must_have"),
-                "priority": priority_map.get(requirement.get("priority", "Medium"), "medium"),
-                "relationships": {
-                    "module": {
-                        "data": {
-                            "type": "documents",
-                            "id": self.document_id
-                        }
-                    }
-                }
+                "status": _DRAFT,
+                "severity": severity,
+                "priority": _PRIORITY_MAP.get(prio_in, "medium"),
+                "relationships": self._module_rel
             },
             "links": [
                 {
                     "target_id": parent_heading_id,
-                    "role": "has_parent",
+                    "role": _HAS_PARENT,
                     "description": f"Links to {parent_heading_title}"
                 }
             ],
@@ -102,53 +248,97 @@ class PolarionHeadingConverter:
         
         return workitem
     
-    def process_requirements(self, brake_data: Dict, heading_map: Dict[str, str]) -> List[Dict]:
-        """Process all requirements and create work items with proper heading links"""
-        output_items = []
+    @staticmethod
+    def count_requirements(brake_data: Dict) -> int:
+        """Count the requirements iter_workitems will convert"""
+        total = 0
+        for chapter in brake_data.get("document", {}).get("chapters", _EMPTY):
+            total += len(chapter.get("workitems") or _EMPTY)
+            for subchapter in chapter.get("subchapters", _EMPTY):
+                total += len(subchapter.get("workitems") or _EMPTY)
+        return total
+    
+    @staticmethod
+    def attach_heading_titles(brake_data: Dict, heading_map: Dict[str, str]) -> None:
+        """Store each chapter's and subchapter's full heading title on it as _title"""
+        for chapter in brake_data.get("document", {}).get("chapters", _EMPTY):
+            chapter["_title"] = heading_map.get(chapter.get("heading_id", ""), chapter.get("heading", ""))
+            for subchapter in chapter.get("subchapters", _EMPTY):
+                subchapter["_title"] = heading_map.get(subchapter.get("heading_id", ""),
+                                                       subchapter.get("heading", ""))
+    
+    def iter_workitems(self, brake_data: Dict) -> Iterator[Tuple[Dict, str]]:
+        """
+        Create work items with proper heading links in document order
+        Yields tuples: (work item, parent heading ID)
+        Heading titles must have been attached with attach_heading_titles
+        """
         document = brake_data.get("document", {})
+        chapters = document.get("chapters", _EMPTY)
         
         print(f"\n📋 Processing chapters and requirements...")
         
         # Process each chapter
-        for chapter in document.get("chapters", []):
-            chapter_heading = chapter.get("heading", "")
-            chapter_heading_id = chapter.get("heading_id", "")
-            chapter_outline = chapter.get("outlineNumber", "")
-            
-            # Get full chapter title from heading map
-            chapter_title = heading_map.get(chapter_heading_id, chapter_heading)
+        if len(chapters) > 1 and self.count_requirements(brake_data) >= _PARALLEL_MIN_REQUIREMENTS:
+            yield from self.iter_workitems_parallel(chapters)
+        else:
+            for chapter in chapters:
+                yield from self.iter_chapter_workitems(chapter)
+    
+    def iter_workitems_parallel(self, chapters: List[Dict]) -> Iterator[Tuple[Dict, str]]:
+        """Convert chapters in worker processes, yielding items in document order"""
+        # Chapters carry their resolved heading titles, so workers only need
+        # the converter settings; progress output is replayed here so it
+        # stays in document order
+        with ProcessPoolExecutor(
+                initializer=_init_worker,
+                initargs=(self.document_id, self.timestamp, self.verbose)) as executor:
+            for items, progress in executor.map(_process_chapter, chapters):
+                sys.stdout.write(progress)
+                yield from items
+    
+    def iter_chapter_workitems(self, chapter: Dict) -> Iterator[Tuple[Dict, str]]:
+        """Yield (work item, parent heading ID) for one chapter and its subchapters"""
+        chapter_heading_id = chapter.get("heading_id", "")
+        
+        chapter_title = chapter["_title"]
+        
+        print(f"\n📂 Chapter: {chapter_title}")
+        
+        # Process direct chapter workitems (if any)
+        workitems = chapter.get("workitems")
+        if workitems:
+            print(f"   Processing {len(workitems)} direct requirements...")
+            for req in workitems:
+                yield self.create_workitem_format(req, chapter_heading_id, chapter_title), chapter_heading_id
+                if self.verbose:
+                    print(f"      ✅ {req['id']}: {req['title'][:40]}... → {chapter_heading_id}")
+        
+        # Process subchapters
+        for subchapter in chapter.get("subchapters", _EMPTY):
+            subchapter_heading_id = subchapter.get("heading_id", "")
             
-            print(f"\n📂 Chapter: {chapter_title}")
+            subchapter_title = subchapter["_title"]
             
-            # Process direct chapter workitems (if any)
-            if "workitems" in chapter and chapter["workitems"]:
-                print(f"   Processing {len(chapter['workitems'])} direct requirements...")
-                for req in chapter["workitems"]:
-                    workitem = self.create_workitem_format(req, chapter_heading_id, chapter_title)
-                    output_items.append(workitem)
-                    print(f"      ✅ {req['id']}: {req['title'][:40]}... → {chapter_heading_id}")
+            print(f"   📁 Subchapter: {subchapter_title}")
             
-            # Process subchapters
-            for subchapter in chapter.get("subchapters", []):
-                subchapter_heading = subchapter.get("heading", "")
-                subchapter_heading_id = subchapter.get("heading_id", "")
-                subchapter_outline = subchapter.get("outlineNumber", "")
-                
-                # Get full subchapter title from heading map
-                subchapter_title = heading_map.get(subchapter_heading_id, subchapter_heading)
-                
-                print(f"   📁 Subchapter: {subchapter_title}")
-                
-                # Process subchapter workitems
-                if "workitems" in subchapter and subchapter["workitems"]:
-                    print(f"      Processing {len(subchapter['workitems'])} requirements...")
-                    for req in subchapter["workitems"]:
-                        # Link to the subchapter heading
-                        workitem = self.create_workitem_format(req, subchapter_heading_id, subchapter_title)
-                        output_items.append(workitem)
+            # Process subchapter workitems
+            workitems = subchapter.get("workitems")
+            if workitems:
+                print(f"      Processing {len(workitems)} requirements...")
+                for req in workitems:
+                    # Link to the subchapter heading
+                    yield (self.create_workitem_format(req, subchapter_heading_id, subchapter_title),
+                           subchapter_heading_id)
+                    if self.verbose:
                         print(f"         ✅ {req['id']}: {req['title'][:35]}... → {subchapter_heading_id}")
-        
-        return output_items
+    
+    @staticmethod
+    def count_parents(workitems: Iterator[Tuple[Dict, str]], parent_counts: Counter) -> Iterator[Dict]:
+        """Pass work items through, counting each under its parent heading ID"""
+        for workitem, parent_id in workitems:
+            parent_counts[parent_id] += 1
+            yield workitem
     
     def run(self, brake_requirements_path: str, discovered_docs_path: str, output_path: str):
         """Main execution method"""
@@ -158,63 +348,87 @@ class PolarionHeadingConverter:
         
         # Load discovered documents for heading titles
         print(f"\n📋 Loading discovered documents from: {discovered_docs_path}")
-        heading_map = self.load_discovered_documents(discovered_docs_path)
+        try:
+            heading_map = self.load_discovered_documents(discovered_docs_path)
+        except FileNotFoundError:
+            print(f"❌ Discovered documents file not found: {discovered_docs_path}")
+            sys.exit(1)
         print(f"✅ Loaded {len(heading_map)} heading definitions")
         
         # Load brake requirements
         print(f"\n📋 Loading brake requirements from: {brake_requirements_path}")
-        brake_data = self.load_brake_requirements(brake_requirements_path)
+        try:
+            brake_data = self.load_brake_requirements(brake_requirements_path)
+        except FileNotFoundError:
+            print(f"❌ Input file not found: {brake_requirements_path}")
+            sys.exit(1)
+        self.attach_heading_titles(brake_data, heading_map)
         
         # Process requirements
         print("\n🔄 Converting requirements with heading links...")
-        output_items = self.process_requirements(brake_data, heading_map)
+        total_items = self.count_requirements(brake_data)
+        parent_counts = Counter()
+        output_items = self.count_parents(self.iter_workitems(brake_data), parent_counts)
         
-        # Create output structure
-        output = {
-            "work_items": output_items,
-            "metadata": {
-                "total_items": len(output_items),
-                "document_id": self.document_id,
-                "conversion_timestamp": self.timestamp,
-                "note": "Each requirement links to its chapter/subchapter heading via has_parent"
-            }
+        # Work items are produced while the output is written; keep the first
+        # one for format validation
+        first_item = next(output_items, None)
+        if first_item is not None:
+            output_items = chain((first_item,), output_items)
+        
+        metadata = {
+            "total_items": total_items,
+            "document_id": self.document_id,
+            "conversion_timestamp": self.timestamp,
+            "note": "Each requirement links to its chapter/subchapter heading via has_parent"
         }
         
-        # Save output
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+        # Save output one work item at a time. Items are still being built
+        # while writing, so write next to the output and only replace it once
+        # the conversion has finished
+        tmp_path = Path(output_path).with_name(Path(output_path).name + ".tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                if self.ndjson:
+                    f.write(_dumps_line(metadata))
+                    for item in output_items:
+                        f.write(_dumps_line(item))
+                elif self.pretty:
+                    f.write(b'{\n  "work_items": ')
+                    _write_array(f, output_items, 1)
+                    f.write(b',\n  "metadata": ' + _dumps_nested(metadata, 1) + b"\n}")
+                else:
+                    f.write(b'{"work_items":')
+                    _write_array_compact(f, output_items)
+                    f.write(b',"metadata":' + _dumps(metadata, compact=True) + b"}")
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        os.replace(tmp_path, output_path)
         
         print(f"\n✅ Output saved to: {output_path}")
         print(f"\n📊 Statistics:")
-        print(f"   - Total work items created: {len(output_items)}")
+        print(f"   - Total work items created: {total_items}")
         
-        # Count unique parent headings
-        parent_headings = {}
-        for item in output_items:
-            for link in item.get("links", []):
-                if link.get("role") == "has_parent":
-                    target = link["target_id"]
-                    parent_headings[target] = parent_headings.get(target, 0) + 1
-        
-        print(f"   - Unique parent headings used: {len(parent_headings)}")
+        # Unique parent headings, counted while the items were built
+        print(f"   - Unique parent headings used: {len(parent_counts)}")
         print(f"\n🔗 Heading link distribution:")
-        for heading_id, count in sorted(parent_headings.items(), key=lambda x: x[1], reverse=True):
+        for heading_id, count in parent_counts.most_common():
             heading_title = heading_map.get(heading_id, "Unknown")
             print(f"   - {heading_id}: {count} requirements ({heading_title})")
         
         # Validate output format
-        self.validate_output_format(output_items)
+        self.validate_output_format(first_item, total_items, parent_counts)
     
-    def validate_output_format(self, output_items: List[Dict]):
+    def validate_output_format(self, first_item: Optional[Dict], total_items: int, parent_counts: Counter):
         """Validate that output matches exact format of workitem_with_links.json"""
         print("\n🔍 Validating output format...")
         
-        if not output_items:
+        if first_item is None:
             print("   ❌ No work items generated")
             return
         
         # Check first item structure
-        first_item = output_items[0]
         required_keys = ["work_item", "links", "children"]
         
         for key in required_keys:
@@ -236,26 +450,34 @@ class PolarionHeadingConverter:
             else:
                 print(f"   ✅ Work item has all required keys")
         
-        # Check that all items have has_parent links
-        items_with_parent = 0
-        for item in output_items:
-            has_parent = False
-            for link in item.get("links", []):
-                if link.get("role") == "has_parent":
-                    has_parent = True
-                    break
-            if has_parent:
-                items_with_parent += 1
+        # Every work item is created with exactly one has_parent link
+        items_with_parent = sum(parent_counts.values())
         
-        print(f"   ✅ {items_with_parent}/{len(output_items)} items have has_parent links")
+        print(f"   ✅ {items_with_parent}/{total_items} items have has_parent links")
         
-        if items_with_parent == len(output_items):
+        if items_with_parent == total_items:
             print("   ✅ All requirements properly linked to headings!")
         else:
-            print(f"   ⚠️  {len(output_items) - items_with_parent} items missing parent links")
+            print(f"   ⚠️  {total_items - items_with_parent} items missing parent links")
         
         print("\n✅ Format validation complete!")
 
+# Converter used by chapters converted in a worker process
+_worker_converter = None
+
+def _init_worker(document_id: str, timestamp: str, verbose: bool):
+    """Set up the worker process converter from the parent's settings"""
+    global _worker_converter
+    _worker_converter = PolarionHeadingConverter(document_id=document_id, verbose=verbose)
+    _worker_converter.timestamp = timestamp
+
+def _process_chapter(chapter: Dict) -> Tuple[List[Tuple[Dict, str]], str]:
+    """Convert one chapter in a worker process; returns its items and progress output"""
+    progress = io.StringIO()
+    with redirect_stdout(progress):
+        items = list(_worker_converter.iter_chapter_workitems(chapter))
+    return items, progress.getvalue()
+
 def main():
     """Main entry point"""
     import argparse
@@ -286,6 +508,22 @@ def main():
         default=None,
         help="Override Polarion document/module ID to associate items with",
     )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Print every converted requirement",
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Write JSON Lines: a metadata line followed by one work item per line",
+    )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the JSON output for reading (default: compact)",
+    )
 
     args = parser.parse_args()
 
@@ -293,21 +531,14 @@ def main():
     discovered_docs = args.discovered
     output_file = args.output
 
-    # Check if input files exist
-    if not Path(brake_requirements).exists():
-        print(f"❌ Input file not found: {brake_requirements}")
-        sys.exit(1)
-
-    if not Path(discovered_docs).exists():
-        print(f"❌ Discovered documents file not found: {discovered_docs}")
-        sys.exit(1)
-
+    # Missing input files are reported when they are loaded
     # Create output directory if needed
     output_dir = Path(output_file).parent
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Create converter and run
-    converter = PolarionHeadingConverter(document_id=args.document_id)
+    converter = PolarionHeadingConverter(document_id=args.document_id, verbose=args.verbose,
+                                         ndjson=args.ndjson, pretty=args.pretty)
     converter.run(brake_requirements, discovered_docs, output_file)
 
 if __name__ == "__main__":